@@ -1,16 +1,75 @@
-import tornado.ioloop
+import tornado.netutil
 import tornado.web
-import motor
+from tornado import process
+from tornado.options import define, options
 from urls import urls
-from fields import Field
+from routes import registry
+from server import Supervisor, serve
+from connections import manager
+from offload import ValidationPool
 
-client = motor.MotorClient()
-db = client.test_database
+define('port', default=8888, type=int)
+define('prefork', default=False, type=bool,
+       help='Fork one worker process per CPU sharing the listening socket')
+define('workers', default=0, type=int,
+       help='Number of pre-forked workers, 0 for the CPU count')
+define('grace', default=10, type=float,
+       help='Seconds a worker may spend draining requests when stopped')
+define('mongo_host', default=None, type=str,
+       help='MongoDB host or mongodb:// URI')
+define('mongo_database', default='test_database', type=str)
+define('max_pool_size', default=100, type=int,
+       help='Maximum connections per MongoDB client')
+define('wait_queue_timeout', default=None, type=int,
+       help='Milliseconds to wait for a free pooled connection')
+define('connect_timeout', default=20000, type=int,
+       help='Milliseconds to wait when opening a MongoDB connection')
+define('routes_collection', default='routes', type=str,
+       help='Collection holding the client/route definitions')
+define('routes_interval', default=30, type=float,
+       help='Seconds between reloads of the route definitions')
+define('validation_threshold', default=1000, type=int,
+       help='Validate payloads with at least this many documents in a '
+            'worker process')
+define('validation_workers', default=None, type=int,
+       help='Validation worker processes per server process, defaults to '
+            'the CPUs left per pre-forked worker (at least 1)')
 
-application = tornado.web.Application(urls, db=db)
 
-Field().is_valid()
+def get_validation_workers():
+    if options.validation_workers is not None:
+        return options.validation_workers
+    if not options.prefork:
+        return None
+    workers = options.workers or process.cpu_count()
+    return max(1, process.cpu_count() // workers)
+
+
+def make_application():
+    db = manager.get_database()
+    registry.watch(db[options.routes_collection], options.routes_interval)
+    validation = ValidationPool(
+        options.validation_threshold, get_validation_workers()
+    )
+    return tornado.web.Application(
+        urls, db=db, routes=registry, validation=validation
+    )
+
+
+def main():
+    options.parse_command_line()
+    manager.configure(
+        options.mongo_host, options.mongo_database, options.max_pool_size,
+        options.wait_queue_timeout, options.connect_timeout
+    )
+
+    sockets = tornado.netutil.bind_sockets(options.port)
+    if options.prefork:
+        Supervisor(
+            sockets, make_application, options.workers, options.grace
+        ).run()
+    else:
+        serve(sockets, make_application, options.grace)
 
 if __name__ == "__main__":
-    application.listen(8888)
-    tornado.ioloop.IOLoop.current().start()
+    main()
@@ -0,0 +1,59 @@
+# coding: utf-8
+import json
+import timeit
+from datetime import datetime
+import models
+from fields.encoder import default
+
+DEFINITION = {
+    'flavor': {'type': 'char', 'max_length': 20},
+    'candy': {'type': 'boolean'},
+    'size': {'type': 'choice', 'choices': ['big', 'small', 'medium']},
+    'price': {'type': 'float', 'min': 0, 'max': 100},
+    'amount': {'type': 'int'},
+    'email': {'type': 'email'},
+    'tags': {'type': 'list', 'field': 'char'},
+}
+
+DOCUMENT = {
+    'flavor': 'Banana',
+    'candy': True,
+    'size': 'big',
+    'price': 4.5,
+    'amount': 3,
+    'email': 'tapioca@pot.com',
+    'tags': ['sweet', 'vegan', 'hot'],
+    'created_at': datetime(1993, 9, 25, 5, 30),
+    'last_updates': [datetime(1993, 9, 25, 5, 30)],
+}
+
+
+def make_models(total):
+    schema = models.Model.make_schema(DEFINITION)
+    items = models.ModelList()
+    for i in range(total):
+        model = models.Model(None, 'tapiocas', schema)
+        model.set_data(DOCUMENT)
+        items.append(model)
+    return items
+
+
+def main(total=10000, repeat=20):
+    items = make_models(total)
+    assert json.loads(items.to_json()) == \
+        json.loads(json.dumps(items.get_data(), default=default))
+
+    generic = min(timeit.repeat(
+        lambda: json.dumps(items.get_data(), default=default),
+        number=1, repeat=repeat
+    ))
+    compiled = min(timeit.repeat(items.to_json, number=1, repeat=repeat))
+
+    print('{} documents'.format(total))
+    print('json.dumps(get_data()): {:8.1f} ms'.format(generic * 1000))
+    print('ModelList.to_json():    {:8.1f} ms'.format(compiled * 1000))
+    print('Speedup:                {:8.1f}x'.format(generic / compiled))
+
+
+if __name__ == '__main__':
+    main()
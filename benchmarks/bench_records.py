@@ -0,0 +1,59 @@
+# coding: utf-8
+import tracemalloc
+from datetime import datetime
+import models
+
+DEFINITION = {
+    'flavor': {'type': 'char', 'max_length': 20},
+    'candy': {'type': 'boolean'},
+    'size': {'type': 'choice', 'choices': ['big', 'small', 'medium']},
+    'price': {'type': 'float', 'min': 0, 'max': 100},
+    'email': {'type': 'email'},
+    'tags': {'type': 'list', 'field': 'char'},
+}
+
+DOCUMENT = {
+    'flavor': 'Banana',
+    'candy': True,
+    'size': 'big',
+    'price': 4.5,
+    'email': 'tapioca@pot.com',
+    'tags': ['sweet', 'vegan', 'hot'],
+    'created_at': datetime(1993, 9, 25, 5, 30),
+    'last_updates': [datetime(1993, 9, 25, 5, 30)],
+}
+
+
+def measure(make, total):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    items = models.ModelList(make() for i in range(total))
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del items
+    return size / total
+
+
+def make_model(schema):
+    model = models.Model(None, 'tapiocas', schema)
+    model.set_data(DOCUMENT)
+    return model
+
+
+def main(total=10000):
+    schema = models.Model.make_schema(DEFINITION)
+    Record = schema.get_record_class()
+
+    model_size = measure(lambda: make_model(schema), total)
+    record_size = measure(lambda: Record(DOCUMENT), total)
+
+    print('{} documents'.format(total))
+    print('Model:  {:8.0f} bytes per record'.format(model_size))
+    print('Record: {:8.0f} bytes per record'.format(record_size))
+    print('Ratio:  {:8.1f}x'.format(model_size / record_size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# coding: utf-8
+import re
+import timeit
+import fields
+
+EMAILS = [
+    'tapioca{}@pot.com'.format(i) if i % 3 else 'tapioca{}'.format(i)
+    for i in range(10000)
+]
+
+URLS = [
+    'https://tapioca{}.vegan/recipes?page={}'.format(i, i) if i % 3
+    else 'tapioca{}.vegan'.format(i)
+    for i in range(10000)
+]
+
+
+def purge_only(field, values):
+    for value in values:
+        re.purge()
+
+
+def match_evicted(field, values):
+    # re.purge() stands in for the pattern being evicted from the re
+    # module cache by the other patterns a busy app matches.
+    for value in values:
+        re.purge()
+        re.match(field.regex, value)
+
+
+def match_cached(field, values):
+    for value in values:
+        re.match(field.regex, value)
+
+
+def match_field(field, values):
+    for value in values:
+        field.match(value)
+
+
+def match_many(field, values):
+    field.match_many(values)
+
+
+def measure(run, field, values, repeat=5):
+    return min(timeit.repeat(lambda: run(field, values),
+                             number=1, repeat=repeat))
+
+
+def bench(name, field, values):
+    print('{} column, {} values'.format(name, len(values)))
+
+    # Recompiling is slow enough to time it on a sample and scale up.
+    sample = values[:len(values) // 100]
+    evicted = measure(match_evicted, field, sample, repeat=1) - \
+        measure(purge_only, field, sample)
+
+    results = [
+        ('re.match, evicted', evicted * len(values) / len(sample)),
+        ('re.match, cached', measure(match_cached, field, values)),
+        ('field.match', measure(match_field, field, values)),
+        ('field.match_many', measure(match_many, field, values)),
+    ]
+    for label, seconds in results:
+        print('  {:18} {:8.2f} ms'.format(label, seconds * 1000))
+
+
+def main():
+    bench('Email', fields.EmailField(), EMAILS)
+    bench('URL', fields.UrlField(), URLS)
+
+
+if __name__ == '__main__':
+    main()
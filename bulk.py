@@ -0,0 +1,125 @@
+# coding: utf-8
+from tornado import gen
+from tornado.concurrent import Future
+from tornado.ioloop import IOLoop
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, OperationFailure
+
+INSERT = 'insert'
+UPDATE = 'update'
+
+NOT_EXECUTED = 'Not executed after a previous error'
+
+
+def make_bulk(collection, requests, ordered=True):
+    if ordered:
+        bulk = collection.initialize_ordered_bulk_op()
+    else:
+        bulk = collection.initialize_unordered_bulk_op()
+
+    for request in requests:
+        if request[0] == INSERT:
+            bulk.insert(request[1])
+        elif request[0] == UPDATE:
+            bulk.find(request[1]).update_one(request[2])
+    return bulk
+
+
+@gen.coroutine
+def execute(collection, requests, ordered=True):
+    errors = {}
+    if not requests:
+        raise gen.Return(errors)
+
+    try:
+        yield make_bulk(collection, requests, ordered).execute()
+    except BulkWriteError as e:
+        for error in e.details.get('writeErrors', []):
+            errors[error['index']] = error['errmsg']
+
+    if ordered and errors:
+        for index in range(min(errors) + 1, len(requests)):
+            errors[index] = NOT_EXECUTED
+
+    raise gen.Return(errors)
+
+
+@gen.coroutine
+def write(collection, requests, batch_size=1000, ordered=True):
+    errors = {}
+
+    for start in range(0, len(requests), batch_size):
+        batch = requests[start:start + batch_size]
+
+        if ordered and errors:
+            batch_errors = dict((i, NOT_EXECUTED) for i in range(len(batch)))
+        else:
+            batch_errors = yield execute(collection, batch, ordered)
+
+        for index, error in batch_errors.items():
+            errors[start + index] = error
+
+    raise gen.Return(errors)
+
+
+class PendingInserts(object):
+    def __init__(self, collection):
+        self.collection = collection
+        self.documents = []
+        self.futures = []
+        self.timeout = None
+
+
+class InsertBuffer(object):
+    def __init__(self, max_documents=100, max_delay=0.005):
+        self.max_documents = max_documents
+        self.max_delay = max_delay
+        self._pending = {}
+
+    def insert(self, name, collection, document):
+        if document.get('_id') is None:
+            document['_id'] = ObjectId()
+
+        pending = self._pending.get(name)
+        if pending is None:
+            pending = self._pending[name] = PendingInserts(collection)
+            pending.timeout = IOLoop.current().call_later(
+                self.max_delay, self.flush, name
+            )
+
+        future = Future()
+        pending.documents.append(document)
+        pending.futures.append(future)
+
+        if len(pending.documents) >= self.max_documents:
+            self.flush(name)
+        return future
+
+    @gen.coroutine
+    def flush(self, name):
+        pending = self._pending.pop(name, None)
+        if pending is None:
+            return
+
+        IOLoop.current().remove_timeout(pending.timeout)
+        requests = [(INSERT, document) for document in pending.documents]
+
+        try:
+            errors = yield execute(pending.collection, requests, False)
+        except Exception as e:
+            for future in pending.futures:
+                future.set_exception(e)
+            return
+
+        for i, future in enumerate(pending.futures):
+            if i in errors:
+                future.set_exception(OperationFailure(errors[i]))
+            else:
+                future.set_result(pending.documents[i]['_id'])
+
+    @gen.coroutine
+    def flush_all(self):
+        yield [self.flush(name) for name in list(self._pending)]
+
+    def __len__(self):
+        return sum(len(p.documents) for p in self._pending.values())
@@ -0,0 +1,139 @@
+# coding: utf-8
+import copy
+import functools
+import time
+from collections import OrderedDict
+from tornado.concurrent import Future
+from fields.schema import freeze
+
+
+def make_key(collection, query):
+    try:
+        return (collection, freeze(query, ordered=True))
+    except TypeError:
+        return None
+
+
+class ModelCache(object):
+    def __init__(self, max_size=1000, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._collections = {}
+        self._generations = {}
+        self._epoch = 0
+
+    def make_key(self, collection, query):
+        return make_key(collection, query)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+
+        if entry is not None and entry[1] is not None \
+                and entry[1] <= time.monotonic():
+            self.discard(key)
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return copy.deepcopy(entry[0])
+
+    def get_generation(self, collection):
+        return self._epoch, self._generations.get(collection, 0)
+
+    def set(self, key, data, ttl=None, generation=None):
+        if generation is not None and \
+                generation != self.get_generation(key[0]):
+            return
+
+        if ttl is None:
+            ttl = self.ttl
+        expires = None if ttl is None else time.monotonic() + ttl
+
+        self._entries[key] = (copy.deepcopy(data), expires)
+        self._entries.move_to_end(key)
+        self._collections.setdefault(key[0], set()).add(key)
+
+        while len(self._entries) > self.max_size:
+            oldest = next(iter(self._entries))
+            self.discard(oldest)
+            self.evictions += 1
+
+    def discard(self, key):
+        if self._entries.pop(key, None) is not None:
+            keys = self._collections.get(key[0])
+            keys.discard(key)
+            if not keys:
+                del self._collections[key[0]]
+
+    def invalidate(self, collection):
+        self._generations[collection] = \
+            self._generations.get(collection, 0) + 1
+        for key in self._collections.pop(collection, ()):
+            self._entries.pop(key, None)
+
+    def clear(self):
+        self._epoch += 1
+        self._generations.clear()
+        self._entries.clear()
+        self._collections.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_stats(self):
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+class SingleFlight(object):
+    def __init__(self):
+        self.shared = 0
+        self._calls = {}
+
+    def do(self, key, call):
+        future = Future()
+
+        waiters = self._calls.get(key)
+        if waiters is not None:
+            self.shared += 1
+            waiters.append(future)
+            return future
+
+        result = call()
+        waiters = self._calls[key] = [future]
+        result.add_done_callback(
+            functools.partial(self.resolve, key, waiters)
+        )
+        return future
+
+    def forget(self, collection):
+        for key in [key for key in self._calls if key[0] == collection]:
+            del self._calls[key]
+
+    def resolve(self, key, waiters, result):
+        if self._calls.get(key) is waiters:
+            del self._calls[key]
+        error = result.exception()
+
+        for i, future in enumerate(waiters):
+            if error is not None:
+                future.set_exception(error)
+            elif i == 0:
+                future.set_result(result.result())
+            else:
+                future.set_result(copy.deepcopy(result.result()))
+
+    def __len__(self):
+        return len(self._calls)
@@ -0,0 +1,57 @@
+# coding: utf-8
+import os
+import motor
+from tornado.ioloop import IOLoop
+
+
+class ConnectionManager(object):
+    def __init__(self, host=None, database='test_database',
+                 max_pool_size=100, wait_queue_timeout=None,
+                 connect_timeout=20000, client_class=None):
+        self.client_class = client_class
+        self.configure(host, database, max_pool_size, wait_queue_timeout,
+                       connect_timeout)
+
+    def configure(self, host=None, database='test_database',
+                  max_pool_size=100, wait_queue_timeout=None,
+                  connect_timeout=20000):
+        self.host = host
+        self.database = database
+        self.max_pool_size = max_pool_size
+        self.wait_queue_timeout = wait_queue_timeout
+        self.connect_timeout = connect_timeout
+        self.reset()
+
+    def get_client_kwargs(self):
+        kwargs = {
+            'max_pool_size': self.max_pool_size,
+            'connectTimeoutMS': self.connect_timeout,
+        }
+        if self.wait_queue_timeout is not None:
+            kwargs['waitQueueTimeoutMS'] = self.wait_queue_timeout
+        return kwargs
+
+    def get_owner(self):
+        return (os.getpid(), IOLoop.current())
+
+    def get_client(self):
+        owner = self.get_owner()
+        if self._client is None or self._owner != owner:
+            client_class = self.client_class or motor.MotorClient
+            self._client = client_class(self.host, **self.get_client_kwargs())
+            self._owner = owner
+        return self._client
+
+    def get_database(self, name=None):
+        return self.get_client()[name or self.database]
+
+    def reset(self):
+        self._client = None
+        self._owner = None
+
+    def close(self):
+        if self._client is not None and self._owner == self.get_owner():
+            self._client.close()
+        self.reset()
+
+manager = ConnectionManager()
@@ -1,5 +1,9 @@
 import re
 from datetime import datetime
+from fields import dates
+from fields.messages import (
+    ErrorMessage, required_message, datetime_message
+)
 
 
 class FieldRegister(object):
@@ -34,19 +38,44 @@ class Field(object):
     def get(self):
         return self.value
 
+    @property
+    def error(self):
+        if isinstance(self._error, ErrorMessage):
+            return self._error.format()
+        return self._error
+
+    @error.setter
+    def error(self, error):
+        self._error = error
+
+    @property
+    def error_code(self):
+        if isinstance(self._error, ErrorMessage):
+            return self._error.code
+        return None
+
+    @classmethod
+    def get_clean_plan(cls):
+        plan = cls.__dict__.get('_clean_plan')
+        if plan is None:
+            names = []
+            for klass in reversed(cls.__mro__):
+                for attr in vars(klass):
+                    if attr.startswith('clean_') and attr not in names:
+                        names.append(attr)
+            plan = tuple(getattr(cls, name) for name in names)
+            cls._clean_plan = plan
+        return plan
+
     def get_clean_methods(self):
-        methods = []
-        for attr in dir(self):
-            if attr.startswith('clean_'):
-                methods.append(getattr(self, attr))
-        return methods
+        return [method.__get__(self) for method in self.get_clean_plan()]
 
     def clean(self):
         self.error = None
         self.cleaned = []
-        for method in self.get_clean_methods():
+        for method in self.get_clean_plan():
             try:
-                self.value = method()
+                self.value = method(self)
             except ValidationException as e:
                 self.error = e.message
                 break
@@ -54,13 +83,26 @@ class Field(object):
 
     def clean_required(self):
         if self.required and self.value is None:
-            raise ValidationException(
-                self.messages.get('required', "This field is required")
-            )
+            raise ValidationException(ErrorMessage('required', self))
         return self.value
 
     def is_valid(self):
-        return self.error is None
+        return self._error is None
+
+    def iter_clean(self, values):
+        for value in values:
+            self.set(value)
+            value = self.clean()
+            yield value, self.is_valid(), self.error
+
+    def bulk_clean(self, values):
+        cleaned = []
+        errors = []
+        for i, (value, valid, error) in enumerate(self.iter_clean(values)):
+            cleaned.append(value)
+            if not valid:
+                errors.append({'index': i, 'error': error})
+        return cleaned, errors
 
 
 class CharField(Field):
@@ -80,25 +122,15 @@ class CharField(Field):
         return super(CharField, self).clean()
 
     def clean_min_length(self):
-        if self.min_length is not None:
+        if self.value is not None and self.min_length is not None:
             if len(self.value) < self.min_length:
-                raise ValidationException(
-                    self.messages.get(
-                        'min_length',
-                        'At least {} characters'
-                    ).format(self.min_length)
-                )
+                raise ValidationException(ErrorMessage('min_length', self))
         return self.value
 
     def clean_max_length(self):
-        if self.max_length is not None:
+        if self.value is not None and self.max_length is not None:
             if len(self.value) > self.max_length:
-                raise ValidationException(
-                    self.messages.get(
-                        'min_length',
-                        'Maximum {} characters'
-                    ).format(self.min_length)
-                )
+                raise ValidationException(ErrorMessage('max_length', self))
         return self.value
 
     def clean_blank(self):
@@ -106,9 +138,7 @@ class CharField(Field):
             return self.value
 
         if not self.blank and len(self.value) == 0:
-            raise ValidationException(
-                self.messages.get('blank', 'This field can\'t be empty')
-            )
+            raise ValidationException(ErrorMessage('blank', self))
         return self.value
 
 
@@ -127,36 +157,22 @@ class IntegerField(Field):
                     if '.' in self.value:
                         self.value = self.value.split('.')[0]
                 self.value = int(self.value)
-            except ValueError:
-                self.error = self.messages.get('not_num', 'This isn\'t a num')
+            except (OverflowError, TypeError, ValueError):
+                self.error = ErrorMessage('not_num', self)
                 return self.value
 
         return super(IntegerField, self).clean()
 
     def clean_min(self, *args, **kwargs):
-        if self.value is not None and self.max:
-            print(self.value)
-            print(self.min)
+        if self.value is not None and self.min is not None:
             if self.value < self.min:
-                raise ValidationException(
-                    self.messages.get(
-                        'min', 'The number must be greater than {}'.format(
-                            self.min
-                        )
-                    )
-                )
+                raise ValidationException(ErrorMessage('min', self))
         return self.value
 
     def clean_max(self, *args, **kwargs):
-        if self.value is not None and self.max:
+        if self.value is not None and self.max is not None:
             if self.value > self.max:
-                raise ValidationException(
-                    self.messages.get(
-                        'min', 'The number must be less than {}'.format(
-                            self.min
-                        )
-                    )
-                )
+                raise ValidationException(ErrorMessage('max', self))
         return self.value
 
 
@@ -167,8 +183,8 @@ class FloatField(IntegerField):
         if self.value is not None:
             try:
                 self.value = float(self.value)
-            except ValueError:
-                self.error = self.messages.get('not_num', 'This isn\'t a num')
+            except (OverflowError, TypeError, ValueError):
+                self.error = ErrorMessage('not_num', self)
                 return self.value
 
         return super(IntegerField, self).clean()
@@ -197,9 +213,7 @@ class ChoiceField(Field):
     def clean_choice(self):
         if self.value is not None:
             if self.value not in self.choices:
-                raise ValidationException(
-                    self.messages.get('choice', '{} isn\'t a valid option.')
-                )
+                raise ValidationException(ErrorMessage('choice', self))
         return self.value
 
 
@@ -214,13 +228,37 @@ class DateTimeField(Field):
         if self.value is not None:
             if type(self.value) is not datetime:
                 try:
-                    self.value = datetime.strptime(self.value, self.format)
-                except ValueError:
+                    self.value = dates.parse(self.value, self.format)
+                except (TypeError, ValueError):
                     raise ValidationException(
-                        self.messages.get('invalid_date', 'Invalid Datetime')
+                        ErrorMessage('invalid_date', self)
                     )
         return self.value
 
+    def bulk_clean(self, values):
+        cleaned = list(values)
+        errors = {}
+
+        if self.required:
+            for i, value in enumerate(cleaned):
+                if value is None:
+                    errors[i] = required_message(self)
+
+        indexes = [
+            i for i, value in enumerate(cleaned)
+            if value is not None and type(value) is not datetime
+        ]
+        parsed = dates.parse_many([cleaned[i] for i in indexes], self.format)
+        for i, value in zip(indexes, parsed):
+            if value is None:
+                errors[i] = datetime_message(self)
+            else:
+                cleaned[i] = value
+
+        return cleaned, [
+            {'index': i, 'error': errors[i]} for i in sorted(errors)
+        ]
+
 
 class DateField(DateTimeField):
     type = 'date'
@@ -231,23 +269,48 @@ class DateField(DateTimeField):
 
 class RegexField(CharField):
     type = 'regex'
+    patterns = {}
+    precheck = None
 
     def __init__(self, regex, *args, **kwargs):
         super(RegexField, self).__init__(*args, **kwargs)
         self.regex = regex
+        self.pattern = self.compile(regex)
+
+    @classmethod
+    def compile(cls, regex):
+        pattern = cls.patterns.get(regex)
+        if pattern is None:
+            pattern = cls.patterns[regex] = re.compile(regex)
+        return pattern
+
+    def match(self, value):
+        if self.precheck is not None and self.precheck not in value:
+            return False
+        return self.pattern.match(value) is not None
+
+    def match_many(self, values):
+        match = self.pattern.match
+        precheck = self.precheck
+
+        if precheck is None:
+            return [match(value) is not None for value in values]
+        return [
+            precheck in value and match(value) is not None
+            for value in values
+        ]
 
     def clean_regex(self):
         if self.value is not None:
-            if re.match(self.regex, self.value) is None:
-                raise ValidationException(
-                    self.messages.get('regex', 'Regex error')
-                )
+            if not self.match(self.value):
+                raise ValidationException(ErrorMessage('regex', self))
         return self.value
 
 
 class EmailField(RegexField):
     type = 'email'
-    REGEX = "^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
+    precheck = '@'
+    REGEX = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
 
     def __init__(self, *args, **kwargs):
         super(EmailField, self).__init__(self.REGEX, *args, **kwargs)
@@ -255,6 +318,7 @@ class EmailField(RegexField):
 
 class UrlField(RegexField):
     type = 'url'
+    precheck = '://'
 
     # Django Fork
     # unicode letters range (must be a unicode string, not a raw string)
@@ -283,55 +347,65 @@ class UrlField(RegexField):
 
 class ListField(Field):
     type = 'list'
-    __value = []
-    fields = []
-    array_errors = []
 
     def __init__(self, field, field_kwargs={}, empty=True, *args, **kwargs):
         self.field_class = fields.get_field(field)
         self.kwargs = field_kwargs
+        self.element = self.field_class(**self.kwargs)
+        self.array_errors = []
         super(ListField, self).__init__(*args, **kwargs)
 
-    def set(self, data):
-        self.value = data
-        self.fields = []
+    def get(self):
+        return self.value
 
-        if data is None:
+    @Field.error.getter
+    def error(self):
+        if self._error is None and self.array_errors:
+            return self.array_errors
+        return Field.error.fget(self)
+
+    def iter_clean_fields(self, chunk_size=1000):
+        self.array_errors = []
+        if self.value is None:
             return
 
-        for value in data:
-            field = self.field_class(**self.kwargs)
-            field.set(value)
-            self.fields.append(field)
+        for start in range(0, len(self.value), chunk_size):
+            values, errors = self.element.bulk_clean(
+                self.value[start:start + chunk_size]
+            )
+            self.value[start:start + len(values)] = values
 
-    def get(self):
-        return self.value
+            for error in errors:
+                error['index'] += start
+                self.array_errors.append(error)
+            yield start + len(values)
 
-    def clean_fields(self):
+    def incremental_clean(self, chunk_size=1000):
+        self.error = None
         self.array_errors = []
+        try:
+            self.clean_required()
+            self.clean_list()
+        except ValidationException as e:
+            self.error = e.message
+            return
+
+        for done in self.iter_clean_fields(chunk_size):
+            yield done
 
-        i = 0
-        for field in self.fields:
-            self.value[i] = field.clean()
-            print(self.error)
-            print(1111)
-            i += 1
+    def clean_list(self):
+        if self.value is not None and type(self.value) is not list:
+            raise ValidationException(ErrorMessage('not_list', self))
+        return self.value
 
+    def clean_fields(self):
+        for done in self.iter_clean_fields():
+            pass
         return self.value
 
     def clean(self):
-        value = super(ListField, self).clean()
-
-        i = 0
-        for field in self.fields:
-            if not field.is_valid():
-                self.array_errors.append({
-                    'index': i,
-                    'error': field.error
-                })
-            i += 1
-
-        return value
+        self.array_errors = []
+        return super(ListField, self).clean()
 
     def is_valid(self):
         valid = super(ListField, self).is_valid()
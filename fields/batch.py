@@ -0,0 +1,234 @@
+# coding: utf-8
+import operator
+from datetime import datetime
+import fields
+from fields import dates, messages
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+NUMPY_THRESHOLD = 64
+
+
+def select(indices, measures, compare, bound):
+    if numpy is not None and len(indices) >= NUMPY_THRESHOLD:
+        mask = compare(numpy.asarray(measures), bound)
+        return [indices[i] for i in numpy.flatnonzero(mask)]
+    return [
+        i for i, measure in zip(indices, measures) if compare(measure, bound)
+    ]
+
+
+def pending(values, errors):
+    return [
+        i for i, value in enumerate(values)
+        if errors[i] is None and value is not None
+    ]
+
+
+def fail(indices, errors, message):
+    for i in indices:
+        errors[i] = message
+
+
+def check_required(field, values, errors):
+    if field.required:
+        fail([
+            i for i, value in enumerate(values)
+            if errors[i] is None and value is None
+        ], errors, messages.required_message(field))
+
+
+def check_length(field, values, errors, compare, bound, message):
+    indices = pending(values, errors)
+    lengths = [len(values[i]) for i in indices]
+    fail(select(indices, lengths, compare, bound), errors, message)
+
+
+def check_min_length(field, values, errors):
+    if field.min_length is not None:
+        check_length(field, values, errors, operator.lt, field.min_length,
+                     messages.min_length_message(field))
+
+
+def check_max_length(field, values, errors):
+    if field.max_length is not None:
+        check_length(field, values, errors, operator.gt, field.max_length,
+                     messages.max_length_message(field))
+
+
+def check_blank(field, values, errors):
+    if not field.blank:
+        indices = pending(values, errors)
+        lengths = [len(values[i]) for i in indices]
+        fail(select(indices, lengths, operator.eq, 0),
+             errors, messages.blank_message(field))
+
+
+def check_range(field, values, errors, compare, bound, message):
+    indices = pending(values, errors)
+    numbers = [values[i] for i in indices]
+    fail(select(indices, numbers, compare, bound), errors, message)
+
+
+def check_min(field, values, errors):
+    if field.min is not None:
+        check_range(field, values, errors, operator.lt, field.min,
+                    messages.min_message(field))
+
+
+def check_max(field, values, errors):
+    if field.max is not None:
+        check_range(field, values, errors, operator.gt, field.max,
+                    messages.max_message(field))
+
+
+def check_choice(field, values, errors):
+    choices = field.choices
+    try:
+        lookup = frozenset(choices)
+    except TypeError:
+        lookup = choices
+
+    invalid = []
+    for i in pending(values, errors):
+        try:
+            found = values[i] in lookup
+        except TypeError:
+            found = values[i] in choices
+        if not found:
+            invalid.append(i)
+    fail(invalid, errors, messages.choice_message(field))
+
+
+def check_datetime(field, values, errors):
+    indices = [
+        i for i in pending(values, errors) if type(values[i]) is not datetime
+    ]
+    parsed = dates.parse_many([values[i] for i in indices], field.format)
+    message = messages.datetime_message(field)
+    for i, value in zip(indices, parsed):
+        if value is None:
+            errors[i] = message
+        else:
+            values[i] = value
+
+
+def check_regex(field, values, errors):
+    indices = pending(values, errors)
+    matches = field.match_many([values[i] for i in indices])
+    fail([
+        i for i, matched in zip(indices, matches) if not matched
+    ], errors, messages.regex_message(field))
+
+
+def clean_none(field, values, errors):
+    pass
+
+
+def clean_char(field, values, errors):
+    for i, value in enumerate(values):
+        if value is not None:
+            values[i] = str(value).strip()
+
+
+def clean_number(field, values, errors, integer=True):
+    message = messages.not_num_message(field)
+    for i, value in enumerate(values):
+        if value is not None:
+            try:
+                if integer and type(value) == str and '.' in value:
+                    value = values[i] = value.split('.')[0]
+                values[i] = int(value) if integer else float(value)
+            except (OverflowError, TypeError, ValueError):
+                errors[i] = message
+
+
+def clean_float(field, values, errors):
+    clean_number(field, values, errors, integer=False)
+
+
+CLEANERS = {
+    fields.Field.clean: clean_none,
+    fields.CharField.clean: clean_char,
+    fields.IntegerField.clean: clean_number,
+    fields.FloatField.clean: clean_float,
+}
+
+CHECKS = {
+    fields.Field.clean_required: check_required,
+    fields.CharField.clean_min_length: check_min_length,
+    fields.CharField.clean_max_length: check_max_length,
+    fields.CharField.clean_blank: check_blank,
+    fields.IntegerField.clean_min: check_min,
+    fields.IntegerField.clean_max: check_max,
+    fields.ChoiceField.clean_choice: check_choice,
+    fields.DateTimeField.clean_datetime: check_datetime,
+    fields.RegexField.clean_regex: check_regex,
+}
+
+
+def is_columnar(field_class):
+    return (
+        field_class.set in (fields.Field.set, fields.BooleanField.set) and
+        field_class.clean in CLEANERS and
+        field_class.is_valid is fields.Field.is_valid and
+        all(check in CHECKS for check in field_class.get_clean_plan())
+    )
+
+
+def validate_column(spec, records):
+    field = spec.make()
+    field_class = type(field)
+    name = spec.name
+    default = field.value
+    coerce = bool if field_class.set is fields.BooleanField.set else None
+
+    values = []
+    for record in records:
+        if name in record:
+            value = record[name]
+            values.append(value if coerce is None else coerce(value))
+        else:
+            values.append(default)
+
+    errors = [None] * len(values)
+    CLEANERS[field_class.clean](field, values, errors)
+    for check in field_class.get_clean_plan():
+        CHECKS[check](field, values, errors)
+
+    return values, [(error is not None, error) for error in errors]
+
+
+def validate_records(spec, records):
+    validate = spec.get_validator()
+
+    values = []
+    errors = []
+    for record in records:
+        cleaned, error = validate(record)
+        values.append(cleaned[spec.name])
+        errors.append((spec.name in error, error.get(spec.name)))
+    return values, errors
+
+
+def validate_many(schema, records):
+    records = list(records)
+    cleaned = [{} for record in records]
+    errors = [{} for record in records]
+
+    for spec in schema.specs:
+        if is_columnar(spec.field_class):
+            values, results = validate_column(spec, records)
+        else:
+            values, results = validate_records(spec, records)
+
+        for i, value in enumerate(values):
+            cleaned[i][spec.name] = value
+            invalid, error = results[i]
+            if invalid:
+                errors[i][spec.name] = error
+
+    return cleaned, errors
@@ -0,0 +1,270 @@
+# coding: utf-8
+from datetime import datetime
+import fields
+from fields import dates
+from fields.messages import (
+    required_message, min_length_message, max_length_message, blank_message,
+    min_message, max_message, choice_message, datetime_message, regex_message,
+    not_num_message, not_list_message
+)
+
+
+class Emitter(object):
+    def __init__(self):
+        self.lines = []
+        self.namespace = {
+            'datetime': datetime,
+        }
+
+    def constant(self, value):
+        name = '_c{}'.format(len(self.namespace))
+        self.namespace[name] = value
+        return name
+
+    def line(self, indent, code, *args):
+        self.lines.append('    ' * indent + code.format(*args))
+
+    def error(self, indent, e, message):
+        self.line(indent, '{} = {}', e, self.constant(message))
+
+    def source(self):
+        return '\n'.join(self.lines) + '\n'
+
+
+def emit_required(emitter, field, indent, v, e):
+    if field.required:
+        emitter.line(indent, 'if {} is None and {} is None:', e, v)
+        emitter.error(indent + 1, e, required_message(field))
+
+
+def emit_min_length(emitter, field, indent, v, e):
+    if field.min_length is not None:
+        emitter.line(indent, 'if {} is None and {} is not None '
+                             'and len({}) < {}:',
+                     e, v, v, emitter.constant(field.min_length))
+        emitter.error(indent + 1, e, min_length_message(field))
+
+
+def emit_max_length(emitter, field, indent, v, e):
+    if field.max_length is not None:
+        emitter.line(indent, 'if {} is None and {} is not None '
+                             'and len({}) > {}:',
+                     e, v, v, emitter.constant(field.max_length))
+        emitter.error(indent + 1, e, max_length_message(field))
+
+
+def emit_blank(emitter, field, indent, v, e):
+    if not field.blank:
+        emitter.line(indent, 'if {} is None and {} is not None '
+                             'and len({}) == 0:', e, v, v)
+        emitter.error(indent + 1, e, blank_message(field))
+
+
+def emit_min(emitter, field, indent, v, e):
+    if field.min is not None:
+        emitter.line(indent, 'if {} is None and {} is not None '
+                             'and {} < {}:',
+                     e, v, v, emitter.constant(field.min))
+        emitter.error(indent + 1, e, min_message(field))
+
+
+def emit_max(emitter, field, indent, v, e):
+    if field.max is not None:
+        emitter.line(indent, 'if {} is None and {} is not None '
+                             'and {} > {}:',
+                     e, v, v, emitter.constant(field.max))
+        emitter.error(indent + 1, e, max_message(field))
+
+
+def emit_choice(emitter, field, indent, v, e):
+    emitter.line(indent, 'if {} is None and {} is not None '
+                         'and {} not in {}:',
+                 e, v, v, emitter.constant(field.choices))
+    emitter.error(indent + 1, e, choice_message(field))
+
+
+def emit_datetime(emitter, field, indent, v, e):
+    emitter.line(indent, 'if {} is None and {} is not None '
+                         'and type({}) is not datetime:', e, v, v)
+    emitter.line(indent + 1, 'try:')
+    emitter.line(indent + 2, '{} = {}({})',
+                 v, emitter.constant(dates.get_parser(field.format)), v)
+    emitter.line(indent + 1, 'except (TypeError, ValueError):')
+    emitter.error(indent + 2, e, datetime_message(field))
+
+
+def emit_regex(emitter, field, indent, v, e):
+    emitter.line(indent, 'if {} is None and {} is not None '
+                         'and not {}({}):',
+                 e, v, emitter.constant(field.match), v)
+    emitter.error(indent + 1, e, regex_message(field))
+
+
+def emit_no_clean(emitter, field, indent, v, e):
+    pass
+
+
+def emit_char_clean(emitter, field, indent, v, e):
+    emitter.line(indent, 'if {} is not None:', v)
+    emitter.line(indent + 1, '{} = str({}).strip()', v, v)
+
+
+def emit_number_clean(emitter, field, indent, v, e, integer=True):
+    emitter.line(indent, 'if {} is not None:', v)
+    emitter.line(indent + 1, 'try:')
+    if integer:
+        emitter.line(indent + 2, 'if type({}) == str and \'.\' in {}:', v, v)
+        emitter.line(indent + 3, '{} = {}.split(\'.\')[0]', v, v)
+        emitter.line(indent + 2, '{} = int({})', v, v)
+    else:
+        emitter.line(indent + 2, '{} = float({})', v, v)
+    emitter.line(indent + 1, 'except (OverflowError, TypeError, ValueError):')
+    emitter.error(indent + 2, e, not_num_message(field))
+
+
+def emit_float_clean(emitter, field, indent, v, e):
+    emit_number_clean(emitter, field, indent, v, e, integer=False)
+
+
+def emit_identity_set(emitter, field, indent, v):
+    pass
+
+
+def emit_boolean_set(emitter, field, indent, v):
+    emitter.line(indent, '{} = bool({})', v, v)
+
+
+SETTERS = {
+    fields.Field.set: emit_identity_set,
+    fields.BooleanField.set: emit_boolean_set,
+}
+
+CLEANERS = {
+    fields.Field.clean: emit_no_clean,
+    fields.CharField.clean: emit_char_clean,
+    fields.IntegerField.clean: emit_number_clean,
+    fields.FloatField.clean: emit_float_clean,
+}
+
+CHECKS = {
+    fields.Field.clean_required: emit_required,
+    fields.CharField.clean_min_length: emit_min_length,
+    fields.CharField.clean_max_length: emit_max_length,
+    fields.CharField.clean_blank: emit_blank,
+    fields.IntegerField.clean_min: emit_min,
+    fields.IntegerField.clean_max: emit_max,
+    fields.ChoiceField.clean_choice: emit_choice,
+    fields.DateTimeField.clean_datetime: emit_datetime,
+    fields.RegexField.clean_regex: emit_regex,
+}
+
+
+def is_supported(field_class):
+    return (
+        field_class.set in SETTERS and
+        field_class.clean in CLEANERS and
+        field_class.is_valid is fields.Field.is_valid and
+        all(check in CHECKS for check in field_class.get_clean_plan())
+    )
+
+
+def emit_checks(emitter, field, indent, v, e):
+    field_class = type(field)
+    CLEANERS[field_class.clean](emitter, field, indent, v, e)
+    for check in field_class.get_clean_plan():
+        CHECKS[check](emitter, field, indent, v, e)
+
+
+def emit_element(emitter, field_class, kwargs, indent):
+    if is_supported(field_class):
+        field = field_class(**kwargs)
+        emitter.line(indent, '_e = None')
+        SETTERS[field_class.set](emitter, field, indent, '_v')
+        emit_checks(emitter, field, indent, '_v', '_e')
+        emitter.line(indent, 'if _e is not None:')
+    else:
+        emitter.line(indent, '_f.set(_v)')
+        emitter.line(indent, '_v = _f.clean()')
+        emitter.line(indent, '_e = _f.error')
+        emitter.line(indent, 'if not _f.is_valid():')
+    emitter.line(indent + 1, 'arr.append({{\'index\': _i, \'error\': _e}})')
+
+
+def emit_list(emitter, spec, field):
+    emitter.line(1, 'e = None')
+    emitter.line(1, 'arr = []')
+    emitter.line(1, 'if {} in data:', repr(spec.name))
+    emitter.line(2, 'v = data[{}]', repr(spec.name))
+    emitter.line(2, 'if v is not None and type(v) is not list:')
+    emitter.error(3, 'e', not_list_message(field))
+    emitter.line(2, 'elif v is not None:')
+    emitter.line(3, '_items = []')
+    if not is_supported(field.field_class):
+        emitter.line(3, '_f = {}(**{})', emitter.constant(field.field_class),
+                     emitter.constant(field.kwargs))
+    emitter.line(3, 'for _i, _v in enumerate(v):')
+    emit_element(emitter, field.field_class, field.kwargs, 4)
+    emitter.line(4, '_items.append(_v)')
+    emitter.line(3, 'v = _items')
+    emitter.line(1, 'else:')
+    emitter.line(2, 'v = {}', emitter.constant(field.value))
+    emit_required(emitter, field, 1, 'v', 'e')
+    emitter.line(1, 'cleaned[{}] = v', repr(spec.name))
+    emitter.line(1, 'if e is not None or arr:')
+    emitter.line(2, 'errors[{}] = arr if e is None else e', repr(spec.name))
+
+
+def emit_field(emitter, spec, field):
+    emitter.line(1, 'e = None')
+    emitter.line(1, 'if {} in data:', repr(spec.name))
+    emitter.line(2, 'v = data[{}]', repr(spec.name))
+    SETTERS[type(field).set](emitter, field, 2, 'v')
+    emitter.line(1, 'else:')
+    emitter.line(2, 'v = {}', emitter.constant(field.value))
+    emit_checks(emitter, field, 1, 'v', 'e')
+    emitter.line(1, 'cleaned[{}] = v', repr(spec.name))
+    emitter.line(1, 'if e is not None:')
+    emitter.line(2, 'errors[{}] = e', repr(spec.name))
+
+
+def emit_fallback(emitter, spec):
+    emitter.line(1, 'f = {}()', emitter.constant(spec.make))
+    emitter.line(1, 'if {} in data:', repr(spec.name))
+    emitter.line(2, 'f.set(data[{}])', repr(spec.name))
+    emitter.line(1, 'f.clean()')
+    emitter.line(1, 'cleaned[{}] = f.get()', repr(spec.name))
+    emitter.line(1, 'if not f.is_valid():')
+    emitter.line(2, 'errors[{}] = f.error', repr(spec.name))
+
+
+def compile_schema(schema, fail_fast=False):
+    return compile_specs(schema.specs, fail_fast)
+
+
+def compile_specs(specs, fail_fast=False):
+    emitter = Emitter()
+    emitter.line(0, 'def validate(data):')
+    emitter.line(1, 'cleaned = {{}}')
+    emitter.line(1, 'errors = {{}}')
+
+    for spec in specs:
+        field = spec.make()
+        if type(field) is fields.ListField:
+            emit_list(emitter, spec, field)
+        elif is_supported(type(field)):
+            emit_field(emitter, spec, field)
+        else:
+            emit_fallback(emitter, spec)
+
+        if fail_fast:
+            emitter.line(1, 'if errors:')
+            emitter.line(2, 'return cleaned, errors')
+
+    emitter.line(1, 'return cleaned, errors')
+
+    source = emitter.source()
+    namespace = emitter.namespace
+    exec(compile(source, '<schema validator>', 'exec'), namespace)
+    validate = namespace['validate']
+    validate.source = source
+    return validate
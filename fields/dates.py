@@ -0,0 +1,56 @@
+# coding: utf-8
+import re
+from datetime import datetime
+
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+DATE_FORMAT = '%Y-%m-%d'
+
+LAYOUTS = {
+    DATETIME_FORMAT: re.compile(
+        r'(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2}):(\d{2})\Z', re.ASCII
+    ),
+    DATE_FORMAT: re.compile(r'(\d{4})-(\d{2})-(\d{2})\Z', re.ASCII),
+}
+
+parsers = {}
+
+
+def make_parser(format):
+    strptime = datetime.strptime
+    layout = LAYOUTS.get(format)
+
+    if layout is None:
+        def parse(value):
+            return strptime(value, format)
+        return parse
+
+    match = layout.match
+
+    def parse(value):
+        found = match(value)
+        if found is None:
+            return strptime(value, format)
+        return datetime(*[int(part) for part in found.groups()])
+    return parse
+
+
+def get_parser(format):
+    parser = parsers.get(format)
+    if parser is None:
+        parser = parsers[format] = make_parser(format)
+    return parser
+
+
+def parse(value, format):
+    return get_parser(format)(value)
+
+
+def parse_many(values, format):
+    parse = get_parser(format)
+    parsed = []
+    for value in values:
+        try:
+            parsed.append(parse(value))
+        except (TypeError, ValueError):
+            parsed.append(None)
+    return parsed
@@ -0,0 +1,142 @@
+# coding: utf-8
+import json
+from math import isfinite
+from datetime import datetime
+import fields
+from fields.compiler import Emitter
+
+try:
+    from bson import ObjectId
+except ImportError:
+    ObjectId = None
+
+escape = json.encoder.encode_basestring_ascii
+
+
+def default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if ObjectId is not None and isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError('{!r} is not JSON serializable'.format(value))
+
+
+def dumps(value):
+    return json.dumps(value, default=default, separators=(',', ':'))
+
+
+def encode_any(value):
+    if value is None:
+        return 'null'
+
+    kind = type(value)
+    if kind is str:
+        return escape(value)
+    if kind is bool:
+        return 'true' if value else 'false'
+    if kind is int:
+        return int.__repr__(value)
+    if kind is float and isfinite(value):
+        return float.__repr__(value)
+    if kind is datetime:
+        return '"' + value.isoformat() + '"'
+    return dumps(value)
+
+
+def encode_id(value):
+    if ObjectId is not None and type(value) is ObjectId:
+        return '"' + str(value) + '"'
+    return encode_any(value)
+
+
+def str_expression(field, v, depth):
+    return '(escape({0}) if type({0}) is str else encode_any({0}))'.format(v)
+
+
+def number_expression(field, v, depth):
+    return (
+        '(int.__repr__({0}) if type({0}) is int else '
+        'float.__repr__({0}) if type({0}) is float and isfinite({0}) else '
+        'encode_any({0}))'
+    ).format(v)
+
+
+def boolean_expression(field, v, depth):
+    return (
+        '(\'true\' if {0} is True else \'false\' if {0} is False else '
+        'encode_any({0}))'
+    ).format(v)
+
+
+def datetime_expression(field, v, depth):
+    return (
+        '(\'"\' + {0}.isoformat() + \'"\' if type({0}) is datetime else '
+        'encode_any({0}))'
+    ).format(v)
+
+
+def list_expression(field, v, depth):
+    item = '_x{}'.format(depth)
+    element = get_expression(field.element, item, depth + 1)
+    return (
+        '(\'[\' + \',\'.join([{1} for {2} in {0}]) + \']\' '
+        'if type({0}) is list else encode_any({0}))'
+    ).format(v, element, item)
+
+
+def any_expression(field, v, depth):
+    return 'encode_any({})'.format(v)
+
+
+def get_expression(field, v, depth=0):
+    if isinstance(field, fields.ListField):
+        return list_expression(field, v, depth)
+    if isinstance(field, fields.BooleanField):
+        return boolean_expression(field, v, depth)
+    if isinstance(field, fields.DateTimeField):
+        return datetime_expression(field, v, depth)
+    if isinstance(field, fields.IntegerField):
+        return number_expression(field, v, depth)
+    if isinstance(field, (fields.CharField, fields.ChoiceField)):
+        return str_expression(field, v, depth)
+    return any_expression(field, v, depth)
+
+
+def compile_encoder(specs, field_map=False):
+    emitter = Emitter()
+    emitter.namespace.update({
+        'escape': escape,
+        'isfinite': isfinite,
+        'encode_any': encode_any,
+        'encode_id': encode_id,
+    })
+
+    emitter.line(0, 'def encode(_id, data):')
+    parts = []
+    for i, spec in enumerate(specs):
+        v = '_v{}'.format(i)
+        if field_map:
+            emitter.line(1, '{} = data[{}].value', v, repr(spec.name))
+        else:
+            emitter.line(1, '{} = data.get({})', v, repr(spec.name))
+
+        key = json.dumps(spec.name) + ':'
+        if i > 0:
+            key = ',' + key
+        parts.append(emitter.constant(key))
+        parts.append(get_expression(spec.make(), v))
+
+    emitter.line(1, 'return \'\'.join((')
+    emitter.line(2, '\'{{"_id":\' + encode_id(_id){} if _id else \'{{\',',
+                 ' + \',\'' if specs else '')
+    for part in parts:
+        emitter.line(2, '{},', part)
+    emitter.line(2, '\'}}\',')
+    emitter.line(1, '))')
+
+    source = emitter.source()
+    namespace = emitter.namespace
+    exec(compile(source, '<schema encoder>', 'exec'), namespace)
+    encode = namespace['encode']
+    encode.source = source
+    return encode
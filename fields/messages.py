@@ -0,0 +1,85 @@
+# coding: utf-8
+
+
+def required_message(field):
+    return field.messages.get('required', "This field is required")
+
+
+def min_length_message(field):
+    return field.messages.get(
+        'min_length', 'At least {} characters'
+    ).format(field.min_length)
+
+
+def max_length_message(field):
+    return field.messages.get(
+        'max_length', 'Maximum {} characters'
+    ).format(field.max_length)
+
+
+def blank_message(field):
+    return field.messages.get('blank', 'This field can\'t be empty')
+
+
+def min_message(field):
+    return field.messages.get(
+        'min', 'The number must be greater than {}'.format(field.min)
+    )
+
+
+def max_message(field):
+    return field.messages.get(
+        'max', 'The number must be less than {}'.format(field.max)
+    )
+
+
+def choice_message(field):
+    return field.messages.get('choice', '{} isn\'t a valid option.')
+
+
+def datetime_message(field):
+    return field.messages.get('invalid_date', 'Invalid Datetime')
+
+
+def regex_message(field):
+    return field.messages.get('regex', 'Regex error')
+
+
+def not_num_message(field):
+    return field.messages.get('not_num', 'This isn\'t a num')
+
+
+def not_list_message(field):
+    return field.messages.get('not_list', 'This isn\'t a list')
+
+
+FORMATTERS = {
+    'required': required_message,
+    'min_length': min_length_message,
+    'max_length': max_length_message,
+    'blank': blank_message,
+    'min': min_message,
+    'max': max_message,
+    'choice': choice_message,
+    'invalid_date': datetime_message,
+    'regex': regex_message,
+    'not_num': not_num_message,
+    'not_list': not_list_message,
+}
+
+
+class ErrorMessage(object):
+    __slots__ = ('code', 'field')
+
+    def __init__(self, code, field):
+        self.code = code
+        self.field = field
+
+    def format(self):
+        return FORMATTERS[self.code](self.field)
+
+    def __str__(self):
+        return self.format()
+
+    def __repr__(self):
+        return '<ErrorMessage {!r}>'.format(self.code)
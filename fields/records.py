@@ -0,0 +1,49 @@
+# coding: utf-8
+
+
+class Record(object):
+    __slots__ = ('_id', 'errors')
+    schema = None
+
+    def __init__(self, data=None):
+        self._id = None
+        self.errors = {}
+
+        if data is None:
+            for name, value in self.schema.defaults.items():
+                setattr(self, name, value)
+        else:
+            self.set_data(data)
+
+    def set_data(self, data):
+        self._id = data.get('_id', None)
+        for name in self.schema.names:
+            setattr(self, name, data.get(name, None))
+
+    @property
+    def __dict__(self):
+        data = {}
+
+        if self._id:
+            data['_id'] = self._id
+
+        for name in self.schema.names:
+            data[name] = getattr(self, name)
+
+        return data
+
+    def is_valid(self, fail_fast=False):
+        cleaned, self.errors = self.schema.validate(self.__dict__, fail_fast)
+        for name, value in cleaned.items():
+            setattr(self, name, value)
+        return not self.errors
+
+    def __repr__(self):
+        return '<{} {!r}>'.format(type(self).__name__, self.__dict__)
+
+
+def make_record_class(schema, name='Record'):
+    return type(name, (Record,), {
+        '__slots__': schema.names,
+        'schema': schema,
+    })
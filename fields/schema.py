@@ -0,0 +1,120 @@
+# coding: utf-8
+from types import MappingProxyType
+import fields
+from fields.compiler import compile_schema, compile_specs
+from fields.encoder import compile_encoder
+from fields.batch import validate_many
+from fields.records import make_record_class
+
+
+def freeze(value, ordered=False):
+    if isinstance(value, dict):
+        items = [
+            (key, freeze(item, ordered)) for key, item in value.items()
+        ]
+        return dict, tuple(items if ordered else sorted(items))
+    if isinstance(value, (list, tuple)):
+        return list, tuple(freeze(item, ordered) for item in value)
+    if isinstance(value, set):
+        return set, frozenset(freeze(item, ordered) for item in value)
+    hash(value)
+    return type(value), value
+
+
+class FieldSpec(object):
+    def __init__(self, name, definition):
+        kwargs = dict(definition)
+        self.name = name
+        self.type = kwargs.pop('type')
+        self.field_class = fields.fields.get_field(self.type)
+        self.kwargs = MappingProxyType(kwargs)
+        self.default = self.make().get()
+        self._validator = None
+
+    def make(self):
+        return self.field_class(**self.kwargs)
+
+    def get_validator(self):
+        if self._validator is None:
+            self._validator = compile_specs([self])
+        return self._validator
+
+
+class Schema(object):
+    def __init__(self, fields, defaults=None):
+        definition = dict(
+            (name, dict(kwargs)) for name, kwargs in fields.items()
+        )
+        if defaults:
+            definition.update(defaults)
+
+        self.fields = MappingProxyType(definition)
+        self.specs = tuple(
+            FieldSpec(name, kwargs) for name, kwargs in definition.items()
+        )
+        self.names = tuple(spec.name for spec in self.specs)
+        self.defaults = MappingProxyType(
+            dict((spec.name, spec.default) for spec in self.specs)
+        )
+
+        self._validators = {}
+        self._encoders = {}
+        self._record_class = None
+
+    def make_fields(self):
+        return [(spec.name, spec.make()) for spec in self.specs]
+
+    def get_validator(self, fail_fast=False):
+        validator = self._validators.get(fail_fast)
+        if validator is None:
+            validator = self._validators[fail_fast] = compile_schema(
+                self, fail_fast
+            )
+        return validator
+
+    def validate(self, data, fail_fast=False):
+        return self.get_validator(fail_fast)(data)
+
+    def get_encoder(self, names=None, field_map=False):
+        encoder = self._encoders.get((names, field_map))
+        if encoder is None:
+            specs = self.specs
+            if names is not None:
+                specs = [spec for spec in specs if spec.name in names]
+            encoder = self._encoders[(names, field_map)] = compile_encoder(
+                specs, field_map
+            )
+        return encoder
+
+    def encode(self, data):
+        return self.get_encoder()(data.get('_id'), data)
+
+    def validate_many(self, records):
+        return validate_many(self, records)
+
+    def get_record_class(self):
+        if self._record_class is None:
+            self._record_class = make_record_class(self)
+        return self._record_class
+
+
+class SchemaRegister(object):
+    schemas = {}
+
+    def get_schema(self, fields, defaults=None):
+        try:
+            key = (freeze(fields), freeze(defaults or {}))
+        except TypeError:
+            return Schema(fields, defaults)
+
+        schema = self.schemas.get(key)
+        if schema is None:
+            schema = self.schemas[key] = Schema(fields, defaults)
+        return schema
+
+    def release(self, schema):
+        for key, value in list(self.schemas.items()):
+            if value is schema:
+                del self.schemas[key]
+
+schemas = SchemaRegister()
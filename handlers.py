@@ -1,14 +1,178 @@
+import json
 import tornado.web
+from tornado import gen
+from tornado.iostream import StreamClosedError
+from models import ModelList
+
+FORMAT_JSON = 'json'
+FORMAT_NDJSON = 'ndjson'
+
+CONTENT_TYPES = {
+    FORMAT_JSON: 'application/json; charset=UTF-8',
+    FORMAT_NDJSON: 'application/x-ndjson; charset=UTF-8',
+}
 
 
 class MainHandler(tornado.web.RequestHandler):
+    active = 0
+
     def initialize(self):
         self.db = self.settings['db']
+        self.routes = self.settings['routes']
+        MainHandler.active += 1
+
+    def on_finish(self):
+        MainHandler.active -= 1
+
+    def get_route(self, client, route):
+        resolved = self.routes.resolve(client, route)
+        if resolved is None:
+            raise tornado.web.HTTPError(404)
+        return resolved
 
 
 class TapiocaHandler(MainHandler):
+    batch_size = 100
+    insert_batch_size = 1000
+
+    def prepare(self):
+        self.closed = False
+
+    def on_connection_close(self):
+        self.closed = True
+
+    def get_format(self, header='Accept'):
+        format = self.get_query_argument('format', None)
+        if format is None:
+            accept = self.request.headers.get(header, '')
+            if 'application/x-ndjson' in accept:
+                format = FORMAT_NDJSON
+            else:
+                format = FORMAT_JSON
+
+        if format not in CONTENT_TYPES:
+            raise tornado.web.HTTPError(400, 'Unknown format {}'.format(
+                format
+            ))
+        return format
+
+    def get_collection(self):
+        return self.db[self.route.get_collection_name()]
+
+    def encode(self, document):
+        return self.route.schema.encode(document)
+
+    @gen.coroutine
     def get(self, client, route):
+        self.route = self.get_route(client, route)
+        format = self.get_format()
+        cursor = self.get_collection().find()
+        cursor.batch_size(self.batch_size)
+        yield self.stream(cursor, format)
+
+    @gen.coroutine
+    def stream(self, cursor, format):
+        self.set_header('Content-Type', CONTENT_TYPES[format])
+
+        if format == FORMAT_NDJSON:
+            chunks = []
+            separator, end = '\n', '\n'
+        else:
+            chunks = ['[']
+            separator, end = ',', ']'
+
+        count = 0
+        try:
+            while (yield cursor.fetch_next):
+                if count:
+                    chunks.append(separator)
+                chunks.append(self.encode(cursor.next_object()))
+                count += 1
+
+                if count % self.batch_size == 0:
+                    yield self.flush_chunks(chunks)
+
+            if count or format == FORMAT_JSON:
+                chunks.append(end)
+            yield self.flush_chunks(chunks)
+        except StreamClosedError:
+            self.closed = True
+
+        if self.closed:
+            yield cursor.close()
+
+    @gen.coroutine
+    def flush_chunks(self, chunks):
+        if self.closed:
+            raise StreamClosedError()
+
+        self.write(''.join(chunks))
+        del chunks[:]
+        yield self.flush()
+
+    def parse_body(self, format):
+        body = self.request.body.decode('utf-8')
+        try:
+            if format == FORMAT_NDJSON:
+                return [json.loads(line) for line in body.splitlines()
+                        if line.strip()]
+            items = json.loads(body)
+        except ValueError as e:
+            raise tornado.web.HTTPError(400, 'Invalid JSON: {}'.format(e))
+
+        if not isinstance(items, list):
+            raise tornado.web.HTTPError(400, 'Expected a JSON array')
+        return items
+
+    @gen.coroutine
+    def validate_many(self, records):
+        validation = self.settings.get('validation')
+        if validation is None:
+            raise gen.Return(self.route.schema.validate_many(records))
+        result = yield validation.validate_many(self.route.schema, records)
+        raise gen.Return(result)
+
+    @gen.coroutine
+    def post(self, client, route):
+        self.route = self.get_route(client, route)
+        items = self.parse_body(self.get_format('Content-Type'))
+
+        errors = []
+        indexes = []
+        records = []
+        for index, item in enumerate(items):
+            if isinstance(item, dict):
+                indexes.append(index)
+                records.append(item)
+            else:
+                errors.append({'index': index, 'error': 'Expected an object'})
+
+        cleaned, validation_errors = yield self.validate_many(records)
+
+        models = ModelList()
+        inserted = []
+        for i, document in enumerate(cleaned):
+            if validation_errors[i]:
+                errors.append({
+                    'index': indexes[i], 'error': validation_errors[i]
+                })
+                continue
+
+            model = self.route.make_model(self.db)
+            model.set_data(document)
+            models.append(model)
+            inserted.append(indexes[i])
+
+        write_errors = yield models.save(
+            self.insert_batch_size, ordered=False, validate=False
+        )
+        for error in write_errors:
+            errors.append({
+                'index': inserted[error['index']], 'error': error['error']
+            })
+
+        errors.sort(key=lambda error: error['index'])
         self.write({
-            'client': client,
-            'route': route
+            'inserted': len(models) - len(write_errors),
+            'errors': errors,
         })
@@ -1,15 +1,82 @@
 # coding: utf-8
-from fields.utils import make_field
-import fields
+from copy import deepcopy
+from fields.schema import Schema, schemas
 from tornado import gen
+from bson import ObjectId
 from datetime import datetime
+from cache import SingleFlight, make_key
+import bulk
+
+HISTORY_CAPPED = 'capped'
+HISTORY_LAST = 'last'
+HISTORY_OFF = 'off'
+
+
+class FieldDescriptor(object):
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance._field_map[self.name].get()
+
+    def __set__(self, instance, value):
+        instance._field_map[self.name].set(value)
+        instance._dirty.add(self.name)
 
 
 class ModelDataMixin(object):
-    def set_data(self, data):
+    def set_data(self, data, fields=None):
         self._id = data.get('_id', None)
         for field in self._fields:
             setattr(self, field, data.get(field, None))
+        self._loaded = None if fields is None else frozenset(fields)
+        self.mark_clean()
+
+    def get_loaded_fields(self):
+        if self._loaded is None:
+            return list(self._fields)
+        return [
+            field for field in self._fields
+            if field in self._loaded or field in self._dirty
+        ]
+
+    def make_projection(self, fields):
+        for field in fields:
+            if field not in self._fields:
+                raise ValueError('{} is not a field of this model'.format(
+                    field
+                ))
+        return list(fields)
+
+    def mark_dirty(self, *fields):
+        self._dirty.update(fields)
+
+    def mark_clean(self):
+        self._dirty.clear()
+        self._snapshot = dict(
+            (name, deepcopy(field.value))
+            for name, field in self._field_map.items()
+            if isinstance(field.value, (list, dict))
+        )
+
+    def get_mutated_fields(self):
+        return [
+            name for name, value in self._snapshot.items()
+            if self._field_map[name].value != value
+        ]
+
+    def is_dirty(self):
+        self._dirty.update(self.get_mutated_fields())
+        return len(self._dirty) > 0
+
+    def to_json(self):
+        names = None
+        if self._loaded is not None:
+            names = tuple(self.get_loaded_fields())
+        encode = self._schema.get_encoder(names, field_map=True)
+        return encode(self._id, self._field_map)
 
     @property
     def __dict__(self):
@@ -18,79 +85,214 @@ class ModelDataMixin(object):
         if self._id:
             fields['_id'] = self._id
 
-        for field in self._fields:
-            fields[field] = super(
-                ModelValidationMixin, self
-            ).__getattribute__(field).value
+        for field in self.get_loaded_fields():
+            fields[field] = self._field_map[field].value
 
         return fields
 
-    def __setattr__(self, item, value):
-        if hasattr(self, item):
-            data = object.__getattribute__(self, item)
-            if isinstance(data, fields.Field):
-                data.set(value)
-                return
-        return super(ModelDataMixin, self).__setattr__(item, value)
-
-    def __getattribute__(self, item):
-        ret = super(ModelValidationMixin, self).__getattribute__(item)
-        if isinstance(ret, fields.Field):
-            return ret.get()
-        return ret
-
 
 class ModelValidationMixin(object):
+    _schema = None
+    _fields = {}
+    _model_classes = {}
+
     def __init__(self, fields):
-        self._fields = fields
-        self._fields.update(self.get_default_fields())
         self.make_fields()
 
+    @classmethod
+    def make_schema(cls, fields):
+        if isinstance(fields, Schema):
+            return fields
+        return schemas.get_schema(fields, cls.get_default_fields())
+
+    @classmethod
+    def get_model_class(cls, fields):
+        if cls._schema is not None:
+            return cls
+
+        schema = cls.make_schema(fields)
+        model_class = cls._model_classes.get((cls, schema))
+        if model_class is None:
+            attrs = {
+                '__module__': cls.__module__,
+                '_schema': schema,
+                '_fields': schema.fields,
+            }
+            for name in schema.names:
+                attrs[name] = FieldDescriptor(name)
+
+            model_class = type(cls.__name__, (cls,), attrs)
+            cls._model_classes[(cls, schema)] = model_class
+        return model_class
+
+    @classmethod
+    def release_model_class(cls, schema):
+        cls._model_classes.pop((cls, schema), None)
+
     def make_fields(self):
-        for name, kwargs in self._fields.items():
-            setattr(self, name, make_field(**kwargs))
+        self._field_map = dict(self._schema.make_fields())
+        self._dirty = set()
+        self._snapshot = {}
+        self._loaded = None
+        self._errors = {}
 
-    def get_default_fields(self):
+    @classmethod
+    def get_default_fields(cls):
         return {}
 
-    def is_valid(self):
-        valid = True
+    @property
+    def errors(self):
+        return dict(
+            (name, field.error) for name, field in self._errors.items()
+        )
 
-        for field in self._fields:
-            data = super(ModelValidationMixin, self).__getattribute__(field)
-            data.clean()
+    def get_error_codes(self):
+        return dict(
+            (name, field.error_code) for name, field in self._errors.items()
+        )
 
-            if not data.is_valid():
-                valid = False
-                self.errors[field] = data.error
-        return valid
+    def is_valid(self, fail_fast=False):
+        self._errors = {}
+
+        for name in self.get_loaded_fields():
+            field = self._field_map[name]
+            field.clean()
+
+            if not field.is_valid():
+                self._errors[name] = field
+                if fail_fast:
+                    break
+        return not self._errors
+
+    def validate_many(self, records):
+        return self._schema.validate_many(records)
 
 
 class ModelBase(ModelDataMixin, ModelValidationMixin):
-    pass
+    def __new__(cls, fields):
+        return super(ModelBase, cls).__new__(cls.get_model_class(fields))
 
 
 class ModelList(list):
     def get_data(self):
         return [data.__dict__ for data in self]
 
+    def to_json(self):
+        return '[' + ','.join([model.to_json() for model in self]) + ']'
+
+    @gen.coroutine
+    def save(self, batch_size=1000, ordered=True, validate=True):
+        errors = []
+        collections = {}
+
+        for index, model in enumerate(self):
+            if validate and not model.is_valid():
+                errors.append({'index': index, 'error': model.errors})
+                continue
+
+            if model._id:
+                update = model.get_update()
+                if update is None:
+                    continue
+                request = (bulk.UPDATE, {'_id': model._id}, update)
+            else:
+                document = model.get_document()
+                document['_id'] = ObjectId()
+                request = (bulk.INSERT, document)
+
+            collection = collections.setdefault(
+                model.get_namespace(), (model.get_collection(), [], [])
+            )
+            collection[1].append(request)
+            collection[2].append(index)
+
+        for collection, requests, indexes in collections.values():
+            write_errors = yield bulk.write(
+                collection, requests, batch_size, ordered
+            )
+
+            for i, request in enumerate(requests):
+                index = indexes[i]
+                if i in write_errors:
+                    errors.append({'index': index, 'error': write_errors[i]})
+                    continue
+
+                if request[0] == bulk.INSERT:
+                    self[index]._id = request[1]['_id']
+                self[index].mark_clean()
+
+            self[indexes[0]].invalidate_cache()
+
+        errors.sort(key=lambda error: error['index'])
+        raise gen.Return(errors)
+
+
+class ModelCursor(object):
+    def __init__(self, model, cursor, projection=None):
+        self._model = model
+        self._cursor = cursor
+        self._projection = projection
+
+    @property
+    def fetch_next(self):
+        return self._cursor.fetch_next
+
+    def next_object(self):
+        data = self._cursor.next_object()
+        if data is None:
+            return None
+        return self._model.make_instance(data, self._projection)
+
+    def batch_size(self, batch_size):
+        self._cursor.batch_size(batch_size)
+        return self
+
+    @gen.coroutine
+    def to_list(self, length):
+        models = ModelList()
+        while length is None or len(models) < length:
+            fetched = yield self.fetch_next
+            if not fetched:
+                break
+            models.append(self.next_object())
+        raise gen.Return(models)
+
 
 class Model(ModelBase):
-    errors = {}
+    history = HISTORY_CAPPED
+    history_size = 10
+    cache = None
+    cache_ttl = None
+    inflight = SingleFlight()
+    insert_buffer = None
     _id = None
     _colection = None
 
+    def __new__(cls, db, collection_name, fields):
+        model_class = cls.get_model_class(fields)
+        return super(Model, cls).__new__(model_class, fields)
+
     def __init__(self, db, collection_name, fields):
         super(Model, self).__init__(fields)
         self._db = db
         self._collection_name = collection_name
         self.created_at = datetime.now()
 
-    def get_default_fields(self):
-        return {
-            'created_at': {'type': 'datetime'},
-            'last_updates': {'type': 'list', 'field': 'datetime'}
+    @classmethod
+    def get_default_fields(cls):
+        fields = {
+            'created_at': {'type': 'datetime'}
         }
+        fields.update(cls.get_history_fields())
+        return fields
+
+    @classmethod
+    def get_history_fields(cls):
+        if cls.history == HISTORY_CAPPED:
+            return {'last_updates': {'type': 'list', 'field': 'datetime'}}
+        if cls.history == HISTORY_LAST:
+            return {'updated_at': {'type': 'datetime'}}
+        return {}
 
     def get_collection(self):
         if self._colection is None:
@@ -101,28 +303,136 @@ class Model(ModelBase):
     def queryset(self):
         return self.get_collection()
 
+    def make_instance(self, data=None, projection=None):
+        instance = type(self)(self._db, self._collection_name, self._schema)
+        if data is not None:
+            instance.set_data(data, projection)
+        return instance
+
+    def find(self, spec=None, projection=None, batch_size=100, **kwargs):
+        if projection is not None:
+            projection = kwargs['fields'] = self.make_projection(projection)
+
+        cursor = self.get_collection().find(spec, **kwargs)
+        return ModelCursor(self, cursor, projection).batch_size(batch_size)
+
+    def get_update(self):
+        if not self.is_dirty():
+            return None
+
+        data = self.__dict__
+        history = self.get_history_fields()
+        update = {}
+
+        for field in self._dirty:
+            if field in history:
+                continue
+            if data[field] is None:
+                update.setdefault('$unset', {})[field] = ''
+            else:
+                update.setdefault('$set', {})[field] = data[field]
+
+        self.add_history(update, datetime.now())
+        return update
+
+    def add_history(self, update, now):
+        if self.history == HISTORY_LAST:
+            self._field_map['updated_at'].set(now)
+            update.setdefault('$set', {})['updated_at'] = now
+
+        elif self.history == HISTORY_CAPPED:
+            last_updates = self._field_map['last_updates']
+            missing = last_updates.value is None and (
+                self._loaded is None or 'last_updates' in self._loaded
+            )
+            value = (last_updates.value or []) + [now]
+            last_updates.set(value[-self.history_size:])
+
+            if 'last_updates' in self._dirty or missing:
+                update.setdefault('$set', {})['last_updates'] = \
+                    last_updates.value
+            else:
+                update['$push'] = {'last_updates': {
+                    '$each': [now],
+                    '$slice': -self.history_size
+                }}
+
+    def get_document(self):
+        if self.created_at is None:
+            self._field_map['created_at'].set(datetime.now())
+        if self.history == HISTORY_CAPPED and self.last_updates is None:
+            self._field_map['last_updates'].set([])
+        return self.__dict__
+
     @gen.coroutine
     def save(self):
         collection = self.get_collection()
 
         if self._id:
-            if self.last_updates is None:
-                self.last_updates = []
+            update = self.get_update()
+            if update is None:
+                return
 
-            self.last_updates.append(datetime.now())
-            future = collection.update({'_id': self._id}, self.__dict__)
+            future = collection.update({'_id': self._id}, update)
             result = yield future
         else:
-            future = collection.insert(self.__dict__)
+            if self.insert_buffer is not None:
+                future = self.insert_buffer.insert(
+                    self.get_namespace(), collection, self.get_document()
+                )
+            else:
+                future = collection.insert(self.get_document())
             result = yield future
             self._id = result
 
+        self.mark_clean()
+        self.invalidate_cache()
+
     @gen.coroutine
     def remove(self):
         collection = self.get_collection()
         yield collection.remove({'_id': self._id})
+        self.invalidate_cache()
+
+    def get_namespace(self):
+        return '{}.{}'.format(self._db.name, self._collection_name)
+
+    def invalidate_cache(self):
+        namespace = self.get_namespace()
+        if self.cache is not None:
+            self.cache.invalidate(namespace)
+        if self.inflight is not None:
+            self.inflight.forget(namespace)
 
     @gen.coroutine
-    def get(self, **kwargs):
-        data = yield self.get_collection().find_one(**kwargs)
-        self.set_data(data)
+    def find_one(self, **kwargs):
+        key = None
+        if self.cache is not None or self.inflight is not None:
+            key = make_key(self.get_namespace(), kwargs)
+
+        generation = None
+        if key is not None and self.cache is not None:
+            data = self.cache.get(key)
+            if data is not None:
+                raise gen.Return(data)
+            generation = self.cache.get_generation(key[0])
+
+        collection = self.get_collection()
+        if key is not None and self.inflight is not None:
+            data = yield self.inflight.do(
+                key, lambda: collection.find_one(**kwargs)
+            )
+        else:
+            data = yield collection.find_one(**kwargs)
+
+        if key is not None and self.cache is not None and data is not None:
+            self.cache.set(key, data, self.cache_ttl, generation)
+        raise gen.Return(data)
+
+    @gen.coroutine
+    def get(self, projection=None, **kwargs):
+        if projection is not None:
+            projection = kwargs['fields'] = self.make_projection(projection)
+
+        data = yield self.find_one(**kwargs)
+        self.set_data(data, projection)
@@ -0,0 +1,48 @@
+# coding: utf-8
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from tornado import gen
+from fields.schema import schemas
+
+
+def validate_many(fields, records):
+    return schemas.get_schema(fields).validate_many(records)
+
+
+class ValidationPool(object):
+    def __init__(self, threshold=1000, max_workers=None,
+                 executor_class=ProcessPoolExecutor, start_method='spawn'):
+        self.threshold = threshold
+        self.max_workers = max_workers
+        self.executor_class = executor_class
+        self.start_method = start_method
+        self._executor = None
+
+    def get_executor(self):
+        if self._executor is None:
+            kwargs = {}
+            if issubclass(self.executor_class, ProcessPoolExecutor):
+                kwargs['mp_context'] = multiprocessing.get_context(
+                    self.start_method
+                )
+            self._executor = self.executor_class(self.max_workers, **kwargs)
+        return self._executor
+
+    def should_offload(self, records):
+        return self.threshold is not None and len(records) >= self.threshold
+
+    @gen.coroutine
+    def validate_many(self, schema, records):
+        records = list(records)
+        if not self.should_offload(records):
+            raise gen.Return(schema.validate_many(records))
+
+        result = yield self.get_executor().submit(
+            validate_many, dict(schema.fields), records
+        )
+        raise gen.Return(result)
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait)
+            self._executor = None
@@ -0,0 +1,120 @@
+# coding: utf-8
+import re
+from tornado import gen
+from tornado.ioloop import IOLoop, PeriodicCallback
+from tornado.log import gen_log
+from fields.schema import schemas
+from models import Model
+
+
+class RouteDefinition(object):
+    def __init__(self, fields, version):
+        self.fields = fields
+        self.version = version
+
+
+class Route(object):
+    def __init__(self, client, name, definition, model=Model):
+        self.client = client
+        self.name = name
+        self.version = definition.version
+        self.model = model
+        try:
+            self.model_class = model.get_model_class(definition.fields)
+            self.schema = self.model_class._schema
+            self.schema.get_validator()
+        except (AttributeError, KeyError, TypeError, ValueError,
+                re.error) as e:
+            raise ValueError('Invalid definition for {}/{}: {!r}'.format(
+                client, name, e
+            ))
+
+    def make_model(self, db):
+        return self.model_class(db, self.get_collection_name(), self.schema)
+
+    def get_collection_name(self):
+        return '{}.{}'.format(self.client, self.name)
+
+    def release(self):
+        schemas.release(self.schema)
+        self.model.release_model_class(self.schema)
+
+
+class RouteRegistry(object):
+    def __init__(self, model=Model):
+        self.model = model
+        self.version = 0
+        self.loading = False
+        self._definitions = {}
+        self._routes = {}
+        self._loaded = set()
+
+    def define(self, client, route, fields, version=None):
+        if version is None:
+            version = self.version + 1
+
+        key = (client, route)
+        definition = RouteDefinition(fields, version)
+        compiled = Route(client, route, definition, self.model)
+        self.version = max(self.version, version)
+
+        self.release(key, compiled.schema)
+        self._definitions[key] = definition
+        self._routes[key] = compiled
+
+    def release(self, key, schema=None):
+        compiled = self._routes.pop(key, None)
+        if compiled is not None and compiled.schema is not schema:
+            compiled.release()
+
+    def remove(self, client, route):
+        self._definitions.pop((client, route), None)
+        self.release((client, route))
+
+    def resolve(self, client, route):
+        return self._routes.get((client, route))
+
+    @gen.coroutine
+    def load(self, collection):
+        loaded = set()
+        cursor = collection.find()
+        while (yield cursor.fetch_next):
+            document = cursor.next_object()
+            try:
+                key = (document['client'], document['route'])
+                version = document.get('version', 0)
+                loaded.add(key)
+
+                definition = self._definitions.get(key)
+                if definition is None or definition.version != version:
+                    self.define(key[0], key[1], document['fields'], version)
+            except (KeyError, ValueError) as e:
+                gen_log.warning('Skipping route %s: %r',
+                                document.get('_id'), e)
+
+        for key in self._loaded - loaded:
+            self.remove(*key)
+        self._loaded = loaded
+
+    def watch(self, collection, interval):
+        @gen.coroutine
+        def reload():
+            if self.loading:
+                return
+            self.loading = True
+            try:
+                yield self.load(collection)
+            except Exception:
+                gen_log.exception('Could not load routes')
+            finally:
+                self.loading = False
+
+        IOLoop.current().add_callback(reload)
+        callback = PeriodicCallback(reload, interval * 1000)
+        callback.start()
+        return callback
+
+    def __len__(self):
+        return len(self._definitions)
+
+registry = RouteRegistry()
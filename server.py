@@ -0,0 +1,134 @@
+# coding: utf-8
+import os
+import signal
+import time
+from tornado import process
+from tornado.httpserver import HTTPServer
+from tornado.ioloop import IOLoop
+from tornado.log import gen_log
+from handlers import MainHandler
+
+
+def serve(sockets, make_application, grace=10):
+    io_loop = IOLoop()
+    io_loop.make_current()
+    application = make_application()
+    server = HTTPServer(application)
+    server.add_sockets(sockets)
+
+    def drain(deadline):
+        if MainHandler.active and io_loop.time() < deadline:
+            io_loop.call_later(0.1, drain, deadline)
+        else:
+            io_loop.stop()
+
+    def stop():
+        gen_log.info('Worker %d draining', os.getpid())
+        server.stop()
+        drain(io_loop.time() + grace)
+
+    def handle_term(signum, frame):
+        io_loop.add_callback_from_signal(stop)
+
+    signal.signal(signal.SIGTERM, handle_term)
+    signal.signal(signal.SIGINT, handle_term)
+    io_loop.start()
+
+    validation = application.settings.get('validation')
+    if validation is not None:
+        validation.shutdown()
+
+
+class Supervisor(object):
+    poll_interval = 0.1
+
+    def __init__(self, sockets, make_application, workers=None, grace=10):
+        self.sockets = sockets
+        self.make_application = make_application
+        self.workers = workers or process.cpu_count()
+        self.grace = grace
+        self.running = False
+        self.children = set()
+        self.stopping = {}
+        self.restart_queue = []
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            for signum in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, signal.SIG_DFL)
+            code = 0
+            try:
+                serve(self.sockets, self.make_application, self.grace)
+            except Exception:
+                gen_log.exception('Worker %d crashed', os.getpid())
+                code = 1
+            os._exit(code)
+
+        gen_log.info('Started worker %d', pid)
+        self.children.add(pid)
+        return pid
+
+    def stop_child(self, pid):
+        if pid not in self.stopping:
+            self.stopping[pid] = time.monotonic() + self.grace
+            os.kill(pid, signal.SIGTERM)
+
+    def handle_hup(self, signum, frame):
+        self.restart_queue = [
+            pid for pid in self.children if pid not in self.stopping
+        ]
+
+    def handle_term(self, signum, frame):
+        self.running = False
+        self.restart_queue = []
+        for pid in list(self.children):
+            self.stop_child(pid)
+
+    def reap(self):
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.children.clear()
+                return
+            if pid == 0:
+                return
+
+            self.children.discard(pid)
+            if self.stopping.pop(pid, None) is None and self.running:
+                gen_log.warning('Worker %d exited with status %d',
+                                pid, status)
+                self.spawn()
+
+    def kill_stale(self):
+        now = time.monotonic()
+        for pid, deadline in list(self.stopping.items()):
+            if deadline <= now and pid in self.children:
+                os.kill(pid, signal.SIGKILL)
+
+    def step_restart(self):
+        if not self.running or not self.restart_queue:
+            return
+        if any(pid in self.children for pid in self.stopping):
+            return
+
+        pid = self.restart_queue.pop(0)
+        if pid in self.children:
+            self.spawn()
+            self.stop_child(pid)
+
+    def run(self):
+        self.running = True
+        signal.signal(signal.SIGHUP, self.handle_hup)
+        signal.signal(signal.SIGTERM, self.handle_term)
+        signal.signal(signal.SIGINT, self.handle_term)
+
+        for i in range(self.workers):
+            self.spawn()
+
+        while self.children:
+            self.reap()
+            self.step_restart()
+            self.kill_stale()
+            time.sleep(self.poll_interval)
@@ -0,0 +1,30 @@
+from fields import batch
+from tests.test_compiler import get_schema, RECORDS
+
+
+def test_validate_many():
+    schema = get_schema()
+    cleaned, errors = schema.validate_many(RECORDS)
+
+    assert len(cleaned) == len(errors) == len(RECORDS)
+    for i, record in enumerate(RECORDS):
+        assert (cleaned[i], errors[i]) == schema.validate(record)
+
+
+def test_validate_many_bulk():
+    schema = get_schema()
+    records = RECORDS * batch.NUMPY_THRESHOLD
+    cleaned, errors = schema.validate_many(records)
+
+    for i, record in enumerate(records):
+        assert (cleaned[i], errors[i]) == schema.validate(record)
+
+
+def test_spec_validator_is_cached():
+    schema = get_schema()
+    for spec in schema.specs:
+        assert spec.get_validator() is spec.get_validator()
+
+
+def test_validate_many_empty():
+    assert get_schema().validate_many([]) == ([], [])
@@ -0,0 +1,141 @@
+import time
+import pytest
+from tornado.concurrent import Future
+from cache import ModelCache, SingleFlight
+
+
+def test_cache_hit_and_miss():
+    cache = ModelCache()
+    key = cache.make_key('tapiocas', {'flavor': 'Banana'})
+
+    assert cache.get(key) is None
+    cache.set(key, {'flavor': 'Banana', 'tags': ['sweet']})
+
+    data = cache.get(key)
+    assert data == {'flavor': 'Banana', 'tags': ['sweet']}
+
+    data['tags'].append('hot')
+    assert cache.get(key)['tags'] == ['sweet']
+    assert cache.get_stats() == {
+        'size': 1, 'hits': 2, 'misses': 1, 'evictions': 0
+    }
+
+
+def test_cache_key():
+    cache = ModelCache()
+    assert cache.make_key('tapiocas', {'spec_or_id': {'a': [1, 2]}}) == \
+        cache.make_key('tapiocas', {'spec_or_id': {'a': [1, 2]}})
+    assert cache.make_key('tapiocas', {'spec_or_id': {'a': [{}, []]}}) \
+        is not None
+
+
+def test_cache_key_types():
+    cache = ModelCache()
+    for query, other in [
+        ({'candy': True}, {'candy': 1}),
+        ({'a': {'b': 1}}, {'a': [['b', 1]]}),
+        ({'a': {'b': 1, 'c': 2}}, {'a': {'c': 2, 'b': 1}}),
+    ]:
+        assert cache.make_key('tapiocas', {'spec_or_id': query}) != \
+            cache.make_key('tapiocas', {'spec_or_id': other})
+
+
+def test_cache_lru():
+    cache = ModelCache(max_size=2)
+    cache.set(('tapiocas', 1), {'n': 1})
+    cache.set(('tapiocas', 2), {'n': 2})
+    cache.get(('tapiocas', 1))
+    cache.set(('tapiocas', 3), {'n': 3})
+
+    assert cache.get(('tapiocas', 2)) is None
+    assert cache.get(('tapiocas', 1)) == {'n': 1}
+    assert cache.evictions == 1
+    assert len(cache) == 2
+
+
+def test_cache_ttl():
+    cache = ModelCache(ttl=60)
+    cache.set(('tapiocas', 1), {'n': 1}, ttl=0.01)
+    cache.set(('tapiocas', 2), {'n': 2})
+    time.sleep(0.02)
+
+    assert cache.get(('tapiocas', 1)) is None
+    assert cache.get(('tapiocas', 2)) == {'n': 2}
+
+
+def test_cache_invalidate():
+    cache = ModelCache()
+    cache.set(('tapiocas', 1), {'n': 1})
+    cache.set(('cakes', 1), {'n': 1})
+    cache.invalidate('tapiocas')
+
+    assert cache.get(('tapiocas', 1)) is None
+    assert cache.get(('cakes', 1)) == {'n': 1}
+
+
+def test_cache_stale_set():
+    cache = ModelCache()
+    generation = cache.get_generation('tapiocas')
+    cache.invalidate('tapiocas')
+    cache.set(('tapiocas', 1), {'n': 1}, generation=generation)
+    assert cache.get(('tapiocas', 1)) is None
+
+    generation = cache.get_generation('tapiocas')
+    cache.clear()
+    cache.set(('tapiocas', 1), {'n': 1}, generation=generation)
+    assert cache.get(('tapiocas', 1)) is None
+
+    generation = cache.get_generation('tapiocas')
+    cache.invalidate('cakes')
+    cache.set(('tapiocas', 1), {'n': 1}, generation=generation)
+    assert cache.get(('tapiocas', 1)) == {'n': 1}
+
+
+@pytest.mark.gen_test
+def test_single_flight():
+    flight = SingleFlight()
+    calls = []
+    result = Future()
+
+    def call():
+        calls.append(1)
+        return result
+
+    futures = [flight.do(('tapiocas', 1), call) for i in range(3)]
+    assert len(calls) == 1
+    assert flight.shared == 2
+
+    result.set_result({'tags': ['sweet']})
+    data = yield futures
+    assert data == [{'tags': ['sweet']}] * 3
+    assert data[1] is not data[0]
+    assert len(flight) == 0
+
+    flight.do(('tapiocas', 1), call)
+    assert len(calls) == 2
+
+
+@pytest.mark.gen_test
+def test_single_flight_forget():
+    flight = SingleFlight()
+    results = [Future() for i in range(3)]
+    calls = []
+
+    def call():
+        calls.append(1)
+        return results[len(calls) - 1]
+
+    first = flight.do(('db.tapiocas', 1), call)
+    flight.do(('db.cakes', 1), call)
+    flight.forget('db.tapiocas')
+    assert len(flight) == 1
+
+    second = flight.do(('db.tapiocas', 1), call)
+    assert len(calls) == 3
+
+    results[0].set_result({'n': 1})
+    assert (yield first) == {'n': 1}
+    assert len(flight) == 2
+
+    results[2].set_result({'n': 2})
+    assert (yield second) == {'n': 2}
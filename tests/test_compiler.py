@@ -0,0 +1,129 @@
+from datetime import datetime
+from fields.schema import Schema
+
+
+def validate_with_fields(schema, data):
+    cleaned = {}
+    errors = {}
+    for name, field in schema.make_fields():
+        if name in data:
+            field.set(data[name])
+        field.clean()
+        cleaned[name] = field.get()
+        if not field.is_valid():
+            errors[name] = field.error
+    return cleaned, errors
+
+
+def get_schema():
+    return Schema({
+        'flavor': {'type': 'char', 'min_length': 2, 'max_length': 8,
+                   'blank': False, 'required': True},
+        'amount': {'type': 'int', 'min': 1, 'max': 10},
+        'rank': {'type': 'int', 'max': 5},
+        'stock': {'type': 'int', 'min': 0},
+        'nickname': {'type': 'char', 'min_length': 2, 'max_length': 4},
+        'price': {'type': 'float', 'min': 0.5, 'max': 9.5,
+                  'messages': {'not_num': 'Give me a price'}},
+        'candy': {'type': 'boolean'},
+        'size': {'type': 'choice', 'choices': ['big', 'small'],
+                 'required': True},
+        'code': {'type': 'regex', 'regex': r'[abc]+'},
+        'email': {'type': 'email'},
+        'site': {'type': 'url'},
+        'made_at': {'type': 'datetime'},
+        'made_on': {'type': 'date'},
+        'emails': {'type': 'list', 'field': 'email'},
+        'sizes': {'type': 'list', 'field': 'int',
+                  'field_kwargs': {'required': True}},
+        'eaten_at': {'type': 'list', 'field': 'datetime',
+                     'field_kwargs': {'required': True}},
+    })
+
+
+RECORDS = [
+    {},
+    {'flavor': 'Banana', 'amount': 3, 'price': '2.5', 'candy': 1,
+     'size': 'big', 'code': 'abc', 'email': 'tapioca@pot.com',
+     'site': 'https://tapioca.vegan', 'made_at': '1993-09-25 05:30:00',
+     'made_on': '1993-09-25', 'emails': ['tapioca@pot.com'],
+     'rank': 5, 'stock': 0, 'nickname': 'Bana',
+     'sizes': [1, '2.3', 4],
+     'eaten_at': ['1993-09-25 05:30:00', datetime(1993, 9, 25)]},
+    {'flavor': ' a ', 'amount': '42', 'price': 'cheap', 'size': 'meat',
+     'rank': 6, 'stock': -1, 'nickname': 'B',
+     'code': 'foo', 'email': 'tapioca', 'site': 'http://bacon',
+     'made_at': '1993-09-25 05:30', 'made_on': '1993-09-32',
+     'emails': ['tapioca@pot.com', 'foobar'], 'sizes': [1, None, 'x'],
+     'eaten_at': ['1993-09-25 05:30:00', None, '1993-9-25 5:30:00',
+                  '1993-02-30 05:30:00', 'yesterday']},
+    {'flavor': '', 'amount': 'x.1', 'price': 10, 'size': 'small',
+     'rank': float('inf'), 'stock': float('nan'), 'nickname': 'Banana',
+     'made_at': datetime(1993, 9, 25), 'emails': None, 'sizes': []},
+    {'flavor': 'Tapioca with cheese', 'amount': 0, 'price': 0.1,
+     'size': None, 'candy': None},
+    {'flavor': 'Banana', 'amount': [1], 'price': {}, 'size': 'big',
+     'made_at': 5, 'made_on': ['1993-09-25'], 'emails': 'tapioca@pot.com',
+     'sizes': 5, 'eaten_at': [5, {}]},
+]
+
+
+def test_compiled_matches_fields():
+    schema = get_schema()
+    for record in RECORDS:
+        assert schema.validate(record) == \
+            validate_with_fields(schema, record)
+
+
+def test_compiled_mistyped_values():
+    schema = get_schema()
+    cleaned, errors = schema.validate(RECORDS[-1])
+    assert set(errors) == {
+        'amount', 'price', 'made_at', 'made_on', 'emails', 'sizes', 'eaten_at'
+    }
+    assert errors['emails'] == 'This isn\'t a list'
+    assert errors['eaten_at'] == [
+        {'index': 0, 'error': 'Invalid Datetime'},
+        {'index': 1, 'error': 'Invalid Datetime'},
+    ]
+
+
+def test_compiled_optional_bounds():
+    schema = get_schema()
+    cleaned, errors = schema.validate({'flavor': 'Banana', 'size': 'big'})
+    assert errors == {}
+    assert cleaned['nickname'] is None and cleaned['rank'] is None
+
+    cleaned, errors = schema.validate(RECORDS[2])
+    assert errors['rank'] == 'The number must be less than 5'
+    assert errors['stock'] == 'The number must be greater than 0'
+    assert errors['nickname'] == 'At least 2 characters'
+
+    cleaned, errors = schema.validate(RECORDS[3])
+    assert errors['rank'] == errors['stock'] == 'This isn\'t a num'
+    assert errors['nickname'] == 'Maximum 4 characters'
+
+
+def test_compiled_validator_is_cached():
+    schema = get_schema()
+    assert schema.get_validator() is schema.get_validator()
+
+
+def test_compiled_does_not_change_data():
+    schema = get_schema()
+    data = {'flavor': 'Banana', 'sizes': ['1', '2'], 'size': 'big'}
+    cleaned, errors = schema.validate(data)
+    assert errors == {}
+    assert cleaned['sizes'] == [1, 2]
+    assert data['sizes'] == ['1', '2']
+
+
+def test_compiled_fail_fast():
+    schema = get_schema()
+    data = {'flavor': 'x', 'size': 'meat', 'amount': 'many'}
+    cleaned, errors = schema.validate(data)
+    assert set(errors) == {'flavor', 'size', 'amount'}
+
+    cleaned, errors = schema.validate(data, fail_fast=True)
+    assert len(errors) == 1
+    assert schema.get_validator(True) is not schema.get_validator()
@@ -0,0 +1,39 @@
+# coding: utf-8
+from connections import ConnectionManager
+
+
+class Client(dict):
+    def __init__(self, host, **kwargs):
+        self.host = host
+        self.kwargs = kwargs
+        self.closed = False
+
+    def __missing__(self, name):
+        return name
+
+    def close(self):
+        self.closed = True
+
+
+def test_shared_client():
+    manager = ConnectionManager(client_class=Client)
+    client = manager.get_client()
+    assert manager.get_client() is client
+    assert manager.get_database() == 'test_database'
+    assert manager.get_database('tapioca') == 'tapioca'
+
+
+def test_pool_options():
+    manager = ConnectionManager('mongodb://db', max_pool_size=5,
+                                wait_queue_timeout=100, client_class=Client)
+    client = manager.get_client()
+    assert client.host == 'mongodb://db'
+    assert client.kwargs == {
+        'max_pool_size': 5,
+        'connectTimeoutMS': 20000,
+        'waitQueueTimeoutMS': 100,
+    }
+
+    manager.close()
+    assert client.closed
+    assert manager.get_client() is not client
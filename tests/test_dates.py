@@ -0,0 +1,50 @@
+from datetime import datetime
+import pytest
+from fields import dates
+
+VALUES = [
+    '1993-09-25 05:30:00',
+    '1993-9-25 5:30:0',
+    '1993-09-25 05:30',
+    '1993-09-25T05:30:00',
+    '1993-02-29 05:30:00',
+    '1996-02-29 23:59:59',
+    '1993-09-25 24:00:00',
+    '1993-09-25 05:30:61',
+    '0000-01-01 00:00:00',
+    '1993-09-25',
+    '1993-09-32',
+    '1993-9-5',
+    ' 1993-09-25',
+    '',
+]
+
+
+def strptime(value, format):
+    try:
+        return datetime.strptime(value, format)
+    except ValueError:
+        return None
+
+
+@pytest.mark.parametrize('format', [
+    dates.DATETIME_FORMAT, dates.DATE_FORMAT, '%d/%m/%Y'
+])
+def test_parse_matches_strptime(format):
+    for value in VALUES + ['25/09/1993']:
+        expected = strptime(value, format)
+        if expected is None:
+            with pytest.raises(ValueError):
+                dates.parse(value, format)
+        else:
+            assert dates.parse(value, format) == expected
+
+
+def test_parse_many():
+    assert dates.parse_many(VALUES, dates.DATE_FORMAT) == [
+        strptime(value, dates.DATE_FORMAT) for value in VALUES
+    ]
+
+
+def test_parser_cache():
+    assert dates.get_parser('%d/%m/%Y') is dates.get_parser('%d/%m/%Y')
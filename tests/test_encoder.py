@@ -0,0 +1,52 @@
+import json
+from datetime import datetime
+from fields.schema import Schema
+from fields.encoder import default
+from tests.test_compiler import get_schema, RECORDS
+
+
+def encode(schema, data, names=None):
+    return schema.get_encoder(names)(data.get('_id'), data)
+
+
+def test_encoder_matches_json():
+    schema = get_schema()
+    for record in RECORDS:
+        cleaned, errors = schema.validate(record)
+        assert json.loads(encode(schema, cleaned)) == \
+            json.loads(json.dumps(cleaned, default=default))
+
+
+def test_encoder_types():
+    schema = Schema({
+        'flavor': {'type': 'char'},
+        'amount': {'type': 'int'},
+        'candy': {'type': 'boolean'},
+        'made_at': {'type': 'datetime'},
+        'sizes': {'type': 'list', 'field': 'int'},
+    })
+    data = {
+        '_id': 42,
+        'flavor': 'Pão "doce"',
+        'amount': '3',
+        'candy': True,
+        'made_at': datetime(1993, 9, 25, 5, 30),
+        'sizes': [1, None],
+    }
+    assert json.loads(encode(schema, data)) == {
+        '_id': 42,
+        'flavor': 'Pão "doce"',
+        'amount': '3',
+        'candy': True,
+        'made_at': '1993-09-25T05:30:00',
+        'sizes': [1, None],
+    }
+    assert encode(schema, {}, ('flavor', 'candy')) == \
+        '{"flavor":null,"candy":null}'
+    assert encode(schema, {'_id': 1}, ()) == '{"_id":1}'
+
+
+def test_encoder_is_cached():
+    schema = get_schema()
+    assert schema.get_encoder() is schema.get_encoder()
+    assert schema.get_encoder(('flavor',)) is not schema.get_encoder()
@@ -246,3 +246,105 @@ def test_make_field():
     field.set('')
     field.clean()
     assert not field.is_valid()
+
+
+def test_clean_plan():
+    names = [m.__name__ for m in fields.RegexField.get_clean_plan()]
+    assert names == [
+        'clean_required', 'clean_min_length', 'clean_max_length',
+        'clean_blank', 'clean_regex'
+    ]
+    assert fields.RegexField.get_clean_plan() is \
+        fields.RegexField.get_clean_plan()
+    assert fields.EmailField.get_clean_plan() == \
+        fields.RegexField.get_clean_plan()
+
+
+def test_regex_patterns():
+    field = fields.EmailField()
+    assert field.pattern is fields.EmailField().pattern
+    assert field.pattern.pattern == fields.EmailField.REGEX
+    assert fields.RegexField(r'[abc]+').pattern is \
+        fields.RegexField(r'[abc]+').pattern
+
+
+def test_regex_precheck():
+    email = fields.EmailField()
+    assert email.match('tapioca@pot.com')
+    assert not email.match('tapioca.pot.com')
+
+    url = fields.UrlField()
+    assert url.match('https://tapioca.vegan')
+    assert not url.match('tapioca.vegan')
+
+
+def test_regex_match_many():
+    values = ['tapioca@pot.com', 'foobar', 'tapioca@pot', 'a@b.co']
+    assert fields.EmailField().match_many(values) == \
+        [True, False, False, True]
+    assert fields.RegexField(r'[abc]+').match_many(['abc', 'xyz']) == \
+        [True, False]
+
+
+def test_datetime_array():
+    field = fields.ListField('datetime', {'required': True})
+    field.set(['1993-09-25 05:30:00', None, '1993-09-25 05:30'])
+    field.clean()
+    assert not field.is_valid()
+    assert field.get()[0] == datetime(1993, 9, 25, 5, 30)
+    assert [error['index'] for error in field.array_errors] == [1, 2]
+
+    field.set(['1993-09-25 05:30:00', datetime(1993, 9, 25)])
+    field.clean()
+    assert field.is_valid()
+
+
+def test_array_element_reuse():
+    field = fields.ListField('email', {'required': True})
+    element = field.element
+    field.set(['tapioca@pot.com', 'foobar', None])
+    field.clean()
+    assert field.element is element
+    assert field.array_errors == [
+        {'index': 1, 'error': 'Regex error'},
+        {'index': 2, 'error': 'This field is required'},
+    ]
+
+    field.set(['tapioca@pot.com'])
+    field.clean()
+    assert field.is_valid()
+
+
+def test_array_incremental_clean():
+    field = fields.ListField('int')
+    field.set(['1', 2, 'x', '4.2', 'y'])
+    assert list(field.incremental_clean(chunk_size=2)) == [2, 4, 5]
+    assert field.get()[:2] == [1, 2]
+    assert field.get()[3] == 4
+    assert [error['index'] for error in field.array_errors] == [2, 4]
+    assert not field.is_valid()
+
+    field = fields.ListField('int', required=True)
+    assert list(field.incremental_clean()) == []
+    assert not field.is_valid()
+
+
+def test_lazy_error():
+    field = fields.CharField(min_length=3, messages={'blank': 'Empty!'})
+    field.set('ab')
+    field.clean()
+    assert not field.is_valid()
+    assert field.error_code == 'min_length'
+    assert field.error == 'At least 3 characters'
+
+    field = fields.CharField(blank=False, messages={'blank': 'Empty!'})
+    field.set('')
+    field.clean()
+    assert field.error_code == 'blank'
+    assert field.error == 'Empty!'
+
+    field.set('tapioca')
+    field.clean()
+    assert field.is_valid()
+    assert field.error is None
+    assert field.error_code is None
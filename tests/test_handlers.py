@@ -0,0 +1,138 @@
+# coding: utf-8
+import json
+from connections import manager
+import pytest
+import tornado.web
+from urls import urls
+from routes import RouteRegistry
+
+
+@pytest.fixture
+def app(io_loop):
+    db = manager.get_database('test_database')
+    routes = RouteRegistry()
+    routes.define('tapioca', 'tapiocas', {
+        'flavor': {'type': 'char', 'required': True},
+    })
+    routes.define('tapioca', 'orders', {
+        'amount': {'type': 'int'},
+        'eaten_at': {'type': 'datetime'},
+        'sizes': {'type': 'list', 'field': 'int'},
+        'note': {'type': 'char', 'min_length': 2},
+        'limit': {'type': 'int', 'max': 5},
+    })
+    return tornado.web.Application(urls, db=db, routes=routes)
+
+
+def get_collection(app):
+    return app.settings['db']['tapioca.tapiocas']
+
+
+@pytest.mark.gen_test
+def test_list(app, http_client, base_url):
+    collection = get_collection(app)
+    yield collection.remove()
+    yield collection.insert([{'flavor': str(i)} for i in range(250)])
+
+    response = yield http_client.fetch(base_url + '/tapioca/tapiocas/')
+    data = json.loads(response.body.decode())
+    assert len(data) == 250
+    assert set(data[0]) == {'_id', 'flavor', 'created_at', 'last_updates'}
+    assert data[0]['created_at'] is None
+
+
+@pytest.mark.gen_test
+def test_list_ndjson(app, http_client, base_url):
+    collection = get_collection(app)
+    yield collection.remove()
+    yield collection.insert([{'flavor': str(i)} for i in range(250)])
+
+    response = yield http_client.fetch(
+        base_url + '/tapioca/tapiocas/',
+        headers={'Accept': 'application/x-ndjson'}
+    )
+    lines = response.body.decode().split('\n')
+    assert lines.pop() == ''
+    assert [json.loads(line)['flavor'] for line in lines] == \
+        [str(i) for i in range(250)]
+
+    response = yield http_client.fetch(
+        base_url + '/tapioca/tapiocas/?format=xml', raise_error=False
+    )
+    assert response.code == 400
+
+
+@pytest.mark.gen_test
+def test_unknown_route(http_client, base_url):
+    response = yield http_client.fetch(
+        base_url + '/tapioca/unknown/', raise_error=False
+    )
+    assert response.code == 404
+
+
+@pytest.mark.gen_test
+def test_bulk_post(app, http_client, base_url):
+    collection = get_collection(app)
+    yield collection.remove()
+
+    body = json.dumps([{'flavor': 'Banana'}, 'Coco', {}, {'flavor': 'Coco'}])
+    response = yield http_client.fetch(
+        base_url + '/tapioca/tapiocas/', method='POST', body=body
+    )
+    data = json.loads(response.body.decode())
+    assert data['inserted'] == 2
+    assert data['errors'] == [
+        {'index': 1, 'error': 'Expected an object'},
+        {'index': 2, 'error': {'flavor': 'This field is required'}},
+    ]
+
+    document = yield collection.find_one({'flavor': 'Coco'})
+    assert document['created_at'] is not None
+
+
+@pytest.mark.gen_test
+def test_bulk_post_ndjson(app, http_client, base_url):
+    collection = get_collection(app)
+    yield collection.remove()
+
+    response = yield http_client.fetch(
+        base_url + '/tapioca/tapiocas/', method='POST',
+        body='{"flavor": "Banana"}\n{"flavor": "Coco"}\n',
+        headers={'Content-Type': 'application/x-ndjson'}
+    )
+    assert json.loads(response.body.decode()) == {
+        'inserted': 2, 'errors': []
+    }
+    count = yield collection.count()
+    assert count == 2
+
+
+@pytest.mark.gen_test
+def test_bulk_post_mistyped(app, http_client, base_url):
+    collection = app.settings['db']['tapioca.orders']
+    yield collection.remove()
+
+    body = json.dumps([
+        {'amount': [1]}, {'eaten_at': 5}, {'sizes': 5}, {'sizes': '12'},
+        {'sizes': ['1', 'x']}, {'amount': '2', 'sizes': ['3']},
+    ])
+    response = yield http_client.fetch(
+        base_url + '/tapioca/orders/', method='POST', body=body
+    )
+    data = json.loads(response.body.decode())
+    assert data['inserted'] == 1
+    assert data['errors'] == [
+        {'index': 0, 'error': {'amount': 'This isn\'t a num'}},
+        {'index': 1, 'error': {'eaten_at': 'Invalid Datetime'}},
+        {'index': 2, 'error': {'sizes': 'This isn\'t a list'}},
+        {'index': 3, 'error': {'sizes': 'This isn\'t a list'}},
+        {'index': 4, 'error': {'sizes': [
+            {'index': 1, 'error': 'This isn\'t a num'}
+        ]}},
+    ]
+
+    document = yield collection.find_one()
+    assert document['amount'] == 2
+    assert document['sizes'] == [3]
+    assert document['last_updates'] == []
+    assert document['created_at'] is not None
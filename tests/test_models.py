@@ -1,13 +1,16 @@
 # coding: utf-8
 import models
-import motor
+from connections import manager
+from cache import ModelCache
+from bulk import InsertBuffer
+from tornado import gen
 import pytest
+import json
 from datetime import datetime
 
 
 def get_db():
-    client = motor.MotorClient()
-    return client['test_database']
+    return manager.get_database('test_database')
 
 
 def get_tapioca():
@@ -134,3 +137,437 @@ def test_remove_all():
     yield tapioca.queryset.remove()
     total = yield tapioca.queryset.count()
     assert total == 0
+
+
+def test_shared_schema():
+    tapioca = get_tapioca()
+    tapioca2 = get_tapioca()
+
+    assert tapioca._schema is tapioca2._schema
+    assert 'created_at' in tapioca._fields
+
+    tapioca.flavor = 'Banana'
+    assert tapioca2.flavor is None
+
+
+def test_validate_many():
+    tapioca = get_tapioca()
+    cleaned, errors = tapioca.validate_many([
+        {'flavor': 'Banana', 'size': 'big'},
+        {'flavor': 'Banana', 'size': 'meat'},
+    ])
+
+    assert cleaned[0]['flavor'] == 'Banana'
+    assert errors[0] == {}
+    assert 'size' in errors[1]
+
+
+def test_fail_fast():
+    tapioca = get_tapioca()
+    tapioca2 = get_tapioca()
+    tapioca.created_at = 'yesterday'
+
+    assert not tapioca.is_valid()
+    assert set(tapioca.errors) == {'created_at', 'size'}
+    assert tapioca.get_error_codes()['size'] == 'required'
+    assert tapioca2.errors == {}
+
+    assert not tapioca.is_valid(fail_fast=True)
+    assert len(tapioca.errors) == 1
+
+    tapioca.created_at = datetime.now()
+    tapioca.size = 'big'
+    assert tapioca.is_valid(fail_fast=True)
+    assert tapioca.errors == {}
+
+
+def test_to_json():
+    tapioca = get_tapioca()
+    tapioca.set_data({
+        '_id': 'tapioca',
+        'flavor': 'Banana',
+        'size': 'big',
+        'created_at': datetime(1993, 9, 25, 5, 30),
+    })
+    assert json.loads(tapioca.to_json()) == {
+        '_id': 'tapioca',
+        'flavor': 'Banana',
+        'candy': False,
+        'size': 'big',
+        'created_at': '1993-09-25T05:30:00',
+        'last_updates': None,
+    }
+
+    partial = tapioca.make_instance({'flavor': 'Coco'}, ['flavor'])
+    tapiocas = models.ModelList([partial, partial])
+    assert tapiocas.to_json() == '[{"flavor":"Coco"},{"flavor":"Coco"}]'
+
+
+def test_field_descriptors():
+    tapioca = get_tapioca()
+
+    assert isinstance(tapioca, models.Model)
+    assert type(tapioca) is type(get_tapioca())
+    assert isinstance(type(tapioca).flavor, models.FieldDescriptor)
+
+    tapioca.flavor = 'Banana'
+    tapioca.topping = 'Coconut'
+    assert tapioca.flavor == 'Banana'
+    assert tapioca.topping == 'Coconut'
+    assert tapioca.__dict__['flavor'] == 'Banana'
+    assert 'topping' not in tapioca.__dict__
+
+
+def test_dirty_update():
+    tapioca = get_tapioca()
+    tapioca.set_data({
+        '_id': 42, 'flavor': 'Banana', 'size': 'big', 'last_updates': []
+    })
+
+    assert not tapioca.is_dirty()
+    assert tapioca.get_update() is None
+
+    tapioca.flavor = 'Mandioqueijo'
+    tapioca.size = None
+    update = tapioca.get_update()
+
+    assert update['$set'] == {'flavor': 'Mandioqueijo'}
+    assert update['$unset'] == {'size': ''}
+    assert update['$push']['last_updates'] == {
+        '$each': [tapioca.last_updates[-1]],
+        '$slice': -tapioca.history_size
+    }
+
+
+@pytest.mark.gen_test
+def test_in_place_update():
+    tapioca = models.Model(get_db(), 'tapiocas', {
+        'flavor': {'type': 'char'},
+        'toppings': {'type': 'list', 'field': 'char'},
+    })
+    tapioca.flavor = 'Banana'
+    tapioca.toppings = ['cinnamon']
+    yield tapioca.save()
+
+    tapioca.toppings.append('sugar')
+    assert tapioca.is_dirty()
+    yield tapioca.save()
+    assert not tapioca.is_dirty()
+
+    data = yield tapioca.queryset.find_one({'_id': tapioca._id})
+    assert data['toppings'] == ['cinnamon', 'sugar']
+    yield tapioca.remove()
+
+
+@pytest.mark.gen_test
+def test_partial_update():
+    tapioca = get_tapioca()
+    tapioca.flavor = 'Brigadeiro'
+    tapioca.size = 'big'
+    yield tapioca.save()
+    assert not tapioca.is_dirty()
+
+    yield tapioca.save()
+    assert tapioca.last_updates == []
+
+    tapioca.size = 'small'
+    yield tapioca.save()
+
+    data = yield tapioca.queryset.find_one({'_id': tapioca._id})
+    assert data['flavor'] == 'Brigadeiro'
+    assert data['size'] == 'small'
+    assert len(data['last_updates']) == 1
+    yield tapioca.remove()
+
+
+@pytest.mark.gen_test
+def test_save_inserted_twice():
+    tapioca = get_tapioca()
+    tapioca.size = 'big'
+    yield tapioca.save()
+
+    data = yield tapioca.queryset.find_one({'_id': tapioca._id})
+    assert data['last_updates'] == []
+
+    for size in ['small', 'medium']:
+        tapioca.size = size
+        yield tapioca.save()
+
+    data = yield tapioca.queryset.find_one({'_id': tapioca._id})
+    assert data['size'] == 'medium'
+    assert len(data['last_updates']) == 2
+    yield tapioca.remove()
+
+
+def test_null_history_update():
+    tapioca = get_tapioca()
+    tapioca.set_data({'_id': 42, 'size': 'big', 'last_updates': None})
+    tapioca.size = 'small'
+    update = tapioca.get_update()
+
+    assert '$push' not in update
+    assert update['$set']['last_updates'] == tapioca.last_updates
+    assert len(tapioca.last_updates) == 1
+
+    tapioca.set_data({'_id': 42, 'size': 'big'}, ['size'])
+    tapioca.size = 'small'
+    assert '$push' in tapioca.get_update()
+
+
+class LastUpdateTapioca(models.Model):
+    history = models.HISTORY_LAST
+
+
+class NoHistoryTapioca(models.Model):
+    history = models.HISTORY_OFF
+
+
+def test_capped_history():
+    tapioca = get_tapioca()
+    tapioca.set_data({'_id': 42, 'size': 'big'})
+
+    for i in range(tapioca.history_size + 5):
+        tapioca.size = 'small'
+        tapioca.get_update()
+
+    assert len(tapioca.last_updates) == tapioca.history_size
+
+
+def test_last_update_history():
+    tapioca = LastUpdateTapioca(get_db(), 'tapiocas', {
+        'flavor': {'type': 'char'}
+    })
+    assert 'last_updates' not in tapioca._fields
+
+    tapioca.set_data({'_id': 42})
+    tapioca.flavor = 'Banana'
+    update = tapioca.get_update()
+
+    assert update == {'$set': {
+        'flavor': 'Banana',
+        'updated_at': tapioca.updated_at
+    }}
+
+
+def test_no_history():
+    tapioca = NoHistoryTapioca(get_db(), 'tapiocas', {
+        'flavor': {'type': 'char'}
+    })
+    assert set(tapioca._fields) == {'flavor', 'created_at'}
+
+    tapioca.set_data({'_id': 42})
+    tapioca.flavor = 'Banana'
+    assert tapioca.get_update() == {'$set': {'flavor': 'Banana'}}
+
+
+@pytest.mark.gen_test
+def test_bulk_save():
+    tapiocas = models.ModelList()
+    for size in ['big', 'small', 'meat', 'medium']:
+        tapioca = get_tapioca()
+        tapioca.flavor = 'Bulk'
+        tapioca.size = size
+        tapiocas.append(tapioca)
+
+    total = yield tapiocas[0].queryset.count()
+    errors = yield tapiocas.save(batch_size=2, ordered=False)
+
+    assert [error['index'] for error in errors] == [2]
+    assert tapiocas[0]._id is not None
+    assert tapiocas[2]._id is None
+
+    total2 = yield tapiocas[0].queryset.count()
+    assert total + 3 == total2
+
+    tapiocas[0].flavor = 'Bulk update'
+    del tapiocas[2]
+    errors = yield tapiocas.save()
+    assert errors == []
+
+    data = yield tapiocas[0].queryset.find_one({'_id': tapiocas[0]._id})
+    assert data['flavor'] == 'Bulk update'
+    yield tapiocas[0].queryset.remove({
+        'flavor': {'$in': ['Bulk', 'Bulk update']}
+    })
+
+
+@pytest.mark.gen_test
+def test_bulk_save_per_database():
+    tapiocas = models.ModelList()
+    for db in [get_db(), manager.get_database('other_database')]:
+        tapioca = models.Model(db, 'tapiocas', {'flavor': {'type': 'char'}})
+        tapioca.flavor = 'Bulk database'
+        tapiocas.append(tapioca)
+
+    errors = yield tapiocas.save()
+    assert errors == []
+
+    for tapioca in tapiocas:
+        count = yield tapioca.queryset.find({
+            'flavor': 'Bulk database'
+        }).count()
+        assert count == 1
+        yield tapioca.queryset.remove({'flavor': 'Bulk database'})
+
+
+@pytest.mark.gen_test
+def test_find():
+    tapioca = get_tapioca()
+    for flavor in ['Stream 1', 'Stream 2', 'Stream 3']:
+        model = tapioca.make_instance()
+        model.flavor = flavor
+        model.size = 'big'
+        yield model.save()
+
+    cursor = tapioca.find({'flavor': {'$regex': '^Stream'}}, batch_size=2)
+    flavors = []
+    while (yield cursor.fetch_next):
+        model = cursor.next_object()
+        assert isinstance(model, models.Model)
+        assert model._id is not None
+        flavors.append(model.flavor)
+
+    assert sorted(flavors) == ['Stream 1', 'Stream 2', 'Stream 3']
+
+    tapiocas = yield tapioca.find({'flavor': 'Stream 1'}).to_list(None)
+    assert len(tapiocas) == 1
+    assert tapiocas.get_data()[0]['flavor'] == 'Stream 1'
+
+    yield tapioca.queryset.remove({'flavor': {'$regex': '^Stream'}})
+
+
+def test_loaded_fields():
+    tapioca = get_tapioca()
+    tapioca.set_data({'_id': 42, 'flavor': 'Banana'}, ['flavor'])
+
+    assert tapioca.__dict__ == {'_id': 42, 'flavor': 'Banana'}
+    assert tapioca.is_valid()
+
+    tapioca.size = 'big'
+    assert tapioca.__dict__ == {'_id': 42, 'flavor': 'Banana', 'size': 'big'}
+
+    with pytest.raises(ValueError):
+        tapioca.make_projection(['flavor', 'price'])
+
+
+@pytest.mark.gen_test
+def test_get_projection():
+    tapioca = get_tapioca()
+    tapioca.flavor = 'Projection'
+    tapioca.size = 'big'
+    yield tapioca.save()
+
+    partial = get_tapioca()
+    yield partial.get(projection=['flavor'], spec_or_id=tapioca._id)
+    assert partial.__dict__ == {'_id': tapioca._id, 'flavor': 'Projection'}
+
+    cursor = tapioca.find({'_id': tapioca._id}, projection=['size'])
+    partials = yield cursor.to_list(None)
+    assert partials.get_data() == [{'_id': tapioca._id, 'size': 'big'}]
+
+    yield tapioca.remove()
+
+
+class CachedTapioca(models.Model):
+    cache = ModelCache()
+
+
+@pytest.mark.gen_test
+def test_cached_get():
+    tapioca = CachedTapioca(get_db(), 'tapiocas', {
+        'flavor': {'type': 'char'}
+    })
+    tapioca.flavor = 'Cached'
+    yield tapioca.save()
+
+    hits = tapioca.cache.hits
+    for i in range(2):
+        cached = tapioca.make_instance()
+        yield cached.get(spec_or_id={'flavor': 'Cached'})
+        assert cached._id == tapioca._id
+    assert tapioca.cache.hits == hits + 1
+
+    cached.flavor = 'Cached again'
+    yield cached.save()
+    assert len(tapioca.cache) == 0
+
+    yield tapioca.get(spec_or_id={'_id': tapioca._id})
+    assert tapioca.flavor == 'Cached again'
+    yield tapioca.remove()
+
+
+@pytest.mark.gen_test
+def test_cached_get_invalidated_while_reading():
+    tapioca = CachedTapioca(get_db(), 'tapiocas', {
+        'flavor': {'type': 'char'}
+    })
+    tapioca.flavor = 'Racing'
+    yield tapioca.save()
+
+    future = tapioca.make_instance().get(spec_or_id={'flavor': 'Racing'})
+    tapioca.invalidate_cache()
+    yield future
+    assert len(tapioca.cache) == 0
+    yield tapioca.remove()
+
+
+@pytest.mark.gen_test
+def test_inflight_per_database():
+    fields = {'flavor': {'type': 'char'}}
+    tapioca = models.Model(get_db(), 'tapiocas', fields)
+    other = models.Model(
+        manager.get_database('other_database'), 'tapiocas', fields
+    )
+    tapioca.flavor = 'Shared'
+    yield tapioca.save()
+
+    found, missing = yield [
+        tapioca.find_one(spec_or_id={'flavor': 'Shared'}),
+        other.find_one(spec_or_id={'flavor': 'Shared'}),
+    ]
+    assert found['_id'] == tapioca._id
+    assert missing is None
+    yield tapioca.remove()
+
+
+class BufferedTapioca(models.Model):
+    insert_buffer = InsertBuffer(max_documents=3, max_delay=0.01)
+
+
+@gen.coroutine
+def save_buffered(flavor, db=None):
+    if db is None:
+        db = get_db()
+    tapioca = BufferedTapioca(db, 'tapiocas', {
+        'flavor': {'type': 'char'}
+    })
+    tapioca.flavor = flavor
+    yield tapioca.save()
+    raise gen.Return(tapioca)
+
+
+@pytest.mark.gen_test
+def test_buffered_insert():
+    tapioca = get_tapioca()
+    total = yield tapioca.queryset.count()
+
+    tapiocas = yield [save_buffered('Buffered') for i in range(5)]
+    assert len(set(tapioca._id for tapioca in tapiocas)) == 5
+    assert len(BufferedTapioca.insert_buffer) == 0
+
+    total2 = yield tapioca.queryset.count()
+    assert total + 5 == total2
+    yield tapioca.queryset.remove({'flavor': 'Buffered'})
+
+
+@pytest.mark.gen_test
+def test_buffered_insert_per_database():
+    other = manager.get_database('other_database')
+    tapiocas = yield [
+        save_buffered('Buffered'), save_buffered('Buffered', other)
+    ]
+
+    for tapioca in tapiocas:
+        count = yield tapioca.queryset.find({'flavor': 'Buffered'}).count()
+        assert count == 1
+        yield tapioca.queryset.remove({'flavor': 'Buffered'})
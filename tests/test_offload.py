@@ -0,0 +1,47 @@
+# coding: utf-8
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from fields.schema import Schema
+from offload import ValidationPool
+
+RECORDS = [
+    {'flavor': 'Banana', 'made_at': '1993-09-25 05:30:00'},
+    {'made_at': 'yesterday'},
+] * 10
+
+
+def get_schema():
+    return Schema({
+        'flavor': {'type': 'char', 'required': True},
+        'made_at': {'type': 'datetime'},
+    })
+
+
+@pytest.mark.gen_test
+def test_inline_validation():
+    schema = get_schema()
+    pool = ValidationPool(threshold=100)
+    result = yield pool.validate_many(schema, RECORDS)
+    assert result == schema.validate_many(RECORDS)
+    assert pool._executor is None
+
+
+@pytest.mark.gen_test
+def test_thread_validation():
+    schema = get_schema()
+    pool = ValidationPool(10, 2, ThreadPoolExecutor)
+    result = yield pool.validate_many(schema, RECORDS)
+    assert result == schema.validate_many(RECORDS)
+    pool.shutdown()
+
+
+@pytest.mark.gen_test
+def test_process_validation():
+    schema = get_schema()
+    pool = ValidationPool(10, 1)
+    cleaned, errors = yield pool.validate_many(schema, RECORDS)
+    assert (cleaned, errors) == schema.validate_many(RECORDS)
+    assert set(errors[1]) == {'flavor', 'made_at'}
+    assert pool._executor._mp_context.get_start_method() == 'spawn'
+    pool.shutdown()
+    assert pool._executor is None
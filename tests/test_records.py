@@ -0,0 +1,56 @@
+from fields.schema import Schema
+from fields.records import Record
+
+
+def get_schema():
+    return Schema({
+        'flavor': {'type': 'char', 'blank': False},
+        'candy': {'type': 'boolean'},
+        'size': {'type': 'choice', 'choices': ['big', 'small'],
+                 'default': 'big'},
+        'amount': {'type': 'int'},
+    })
+
+
+def test_record_class():
+    schema = get_schema()
+    Tapioca = schema.get_record_class()
+
+    assert schema.get_record_class() is Tapioca
+    assert issubclass(Tapioca, Record)
+    assert not hasattr(Tapioca(), '__weakref__')
+
+
+def test_record_defaults():
+    tapioca = get_schema().get_record_class()()
+    assert tapioca.size == 'big'
+    assert tapioca.candy is False
+    assert tapioca.flavor is None
+
+
+def test_record_data():
+    Tapioca = get_schema().get_record_class()
+    tapioca = Tapioca({'_id': 42, 'flavor': 'Banana', 'amount': '3'})
+
+    assert tapioca._id == 42
+    assert tapioca.size is None
+    assert tapioca.__dict__ == {
+        '_id': 42,
+        'flavor': 'Banana',
+        'candy': None,
+        'size': None,
+        'amount': '3'
+    }
+
+
+def test_record_is_valid():
+    tapioca = get_schema().get_record_class()({'flavor': 'Banana'})
+    tapioca.amount = '3'
+    assert tapioca.is_valid()
+    assert tapioca.amount == 3
+    assert tapioca.candy is False
+
+    tapioca.flavor = ''
+    tapioca.size = 'meat'
+    assert not tapioca.is_valid()
+    assert set(tapioca.errors) == {'flavor', 'size'}
@@ -0,0 +1,91 @@
+# coding: utf-8
+import pytest
+from connections import manager
+from fields.schema import schemas
+from models import Model
+from routes import RouteRegistry
+
+FIELDS = {
+    'flavor': {'type': 'char'},
+}
+
+
+def test_resolve():
+    routes = RouteRegistry()
+    assert routes.resolve('tapioca', 'tapiocas') is None
+
+    routes.define('tapioca', 'tapiocas', FIELDS)
+    route = routes.resolve('tapioca', 'tapiocas')
+    assert route is routes.resolve('tapioca', 'tapiocas')
+    assert route.get_collection_name() == 'tapioca.tapiocas'
+    assert 'flavor' in route.schema.names
+
+    model = route.make_model(None)
+    assert type(model) is route.model_class
+    assert model._collection_name == 'tapioca.tapiocas'
+
+
+def test_version_invalidation():
+    routes = RouteRegistry()
+    routes.define('tapioca', 'tapiocas', FIELDS)
+    route = routes.resolve('tapioca', 'tapiocas')
+
+    routes.define('tapioca', 'tapiocas', {'size': {'type': 'int'}})
+    updated = routes.resolve('tapioca', 'tapiocas')
+    assert updated is not route
+    assert updated.version > route.version
+    assert 'size' in updated.schema.names
+
+    routes.remove('tapioca', 'tapiocas')
+    assert routes.resolve('tapioca', 'tapiocas') is None
+
+
+def test_invalid_definition():
+    routes = RouteRegistry()
+    routes.define('tapioca', 'tapiocas', FIELDS)
+    route = routes.resolve('tapioca', 'tapiocas')
+
+    for fields in [{'size': {'type': 'unknown'}},
+                   {'size': {'type': 'int', 'unknown': 1}},
+                   {'size': {}}]:
+        with pytest.raises(ValueError):
+            routes.define('tapioca', 'tapiocas', fields)
+    assert routes.resolve('tapioca', 'tapiocas') is route
+
+
+def test_release():
+    routes = RouteRegistry()
+    routes.define('tapioca', 'tapiocas', {'filling': {'type': 'char'}})
+    route = routes.resolve('tapioca', 'tapiocas')
+    assert route.schema in schemas.schemas.values()
+
+    routes.define('tapioca', 'tapiocas', {'size': {'type': 'int'}})
+    assert route.schema not in schemas.schemas.values()
+    assert (Model, route.schema) not in Model._model_classes
+
+
+@pytest.mark.gen_test
+def test_load():
+    collection = manager.get_database('test_database')['routes']
+    yield collection.remove()
+    yield collection.insert([
+        {'client': 'tapioca', 'route': 'tapiocas', 'fields': FIELDS},
+        {'client': 'tapioca', 'route': 'broken',
+         'fields': {'size': {'type': 'unknown'}}},
+    ])
+
+    routes = RouteRegistry()
+    yield routes.load(collection)
+    assert 'flavor' in routes.resolve('tapioca', 'tapiocas').schema.names
+    assert routes.resolve('tapioca', 'broken') is None
+
+    yield collection.update({'route': 'tapiocas'}, {'$set': {
+        'fields': {'size': {'type': 'int'}}, 'version': 1
+    }})
+    yield routes.load(collection)
+    assert 'size' in routes.resolve('tapioca', 'tapiocas').schema.names
+
+    yield collection.remove({'route': 'tapiocas'})
+    yield routes.load(collection)
+    assert routes.resolve('tapioca', 'tapiocas') is None
+    yield collection.remove()
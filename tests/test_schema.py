@@ -0,0 +1,61 @@
+from fields.schema import Schema, schemas, freeze
+import fields
+
+
+def get_definition():
+    return {
+        'flavor': {'type': 'char', 'max_length': 10},
+        'size': {
+            'type': 'choice',
+            'choices': ['big', 'small'],
+            'default': 'big'
+        }
+    }
+
+
+def test_schema():
+    schema = Schema(get_definition(), {'created_at': {'type': 'datetime'}})
+
+    assert set(schema.names) == {'flavor', 'size', 'created_at'}
+    assert schema.defaults['size'] == 'big'
+    assert schema.defaults['flavor'] is None
+
+    spec = schema.specs[schema.names.index('flavor')]
+    assert spec.field_class == fields.CharField
+    assert 'type' not in spec.kwargs
+
+
+def test_schema_make_fields():
+    schema = Schema(get_definition())
+    made = dict(schema.make_fields())
+    again = dict(schema.make_fields())
+
+    assert isinstance(made['flavor'], fields.CharField)
+    assert made['size'].get() == 'big'
+    assert made['flavor'] is not again['flavor']
+
+
+def test_schema_does_not_change_definition():
+    definition = get_definition()
+    Schema(definition, {'created_at': {'type': 'datetime'}})
+    assert 'created_at' not in definition
+    assert definition['flavor']['type'] == 'char'
+
+
+def test_schema_register():
+    schema = schemas.get_schema(get_definition())
+    assert schemas.get_schema(get_definition()) is schema
+    assert schemas.get_schema(get_definition(), {
+        'created_at': {'type': 'datetime'}
+    }) is not schema
+
+
+def test_schema_register_types():
+    boolean = schemas.get_schema({'n': {'type': 'int', 'default': True}})
+    number = schemas.get_schema({'n': {'type': 'int', 'default': 1}})
+    assert number is not boolean
+    assert number.defaults['n'] == 1 and type(number.defaults['n']) is int
+
+    assert freeze({'a': {'b': 1}}) != freeze({'a': [['b', 1]]})
+    assert freeze({'a': 0}) != freeze({'a': False})
+    assert freeze({'a': 1, 'b': 2}) == freeze({'b': 2, 'a': 1})
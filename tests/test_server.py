@@ -0,0 +1,83 @@
+# coding: utf-8
+import os
+import signal
+import time
+from urllib.request import urlopen
+import tornado.netutil
+import tornado.web
+from server import Supervisor, serve
+
+
+class PidHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.write(str(os.getpid()))
+
+
+def make_application():
+    return tornado.web.Application([(r'/', PidHandler)])
+
+
+def bind():
+    sockets = tornado.netutil.bind_sockets(0, '127.0.0.1')
+    return sockets, sockets[0].getsockname()[1]
+
+
+def fetch_pid(port):
+    return int(urlopen('http://127.0.0.1:{}/'.format(port), timeout=5).read())
+
+
+def wait_for(condition, supervisor=None, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        if supervisor is not None:
+            supervisor.reap()
+            supervisor.step_restart()
+            supervisor.kill_stale()
+        time.sleep(0.05)
+
+
+def test_serve():
+    sockets, port = bind()
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            serve(sockets, make_application, grace=1)
+        except Exception:
+            code = 1
+        os._exit(code)
+
+    try:
+        assert fetch_pid(port) == pid
+    finally:
+        os.kill(pid, signal.SIGTERM)
+        status = os.waitpid(pid, 0)[1]
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+
+
+def test_supervisor():
+    sockets, port = bind()
+    supervisor = Supervisor(sockets, make_application, workers=2, grace=1)
+    supervisor.running = True
+    for i in range(supervisor.workers):
+        supervisor.spawn()
+
+    try:
+        started = set(supervisor.children)
+        assert fetch_pid(port) in started
+
+        crashed = started.pop()
+        os.kill(crashed, signal.SIGKILL)
+        wait_for(lambda: crashed not in supervisor.children and
+                 len(supervisor.children) == 2, supervisor)
+
+        workers = set(supervisor.children)
+        supervisor.handle_hup(signal.SIGHUP, None)
+        wait_for(lambda: not workers & supervisor.children and
+                 len(supervisor.children) == 2, supervisor)
+        assert fetch_pid(port) in supervisor.children
+    finally:
+        supervisor.handle_term(signal.SIGTERM, None)
+        wait_for(lambda: not supervisor.children, supervisor)
+    assert not supervisor.stopping